@@ -1,75 +1,139 @@
 # Building an Arithmetic Formatter Project
 
-def arithmetic_arranger(problems, show_answers=False):
+from fractions import Fraction
+import time
+
+# Maximum number of problems arithmetic_arranger() lays out at once
+MAX_PROBLEMS = 5
+
+# Number of characters write_worksheet() buffers before each write
+WRITE_CHUNK_SIZE = 1 << 16
+
+# Operators of the extended mode and how to solve them
+EXTENDED_OPERATORS = {
+    '+': lambda first, second: first + second,
+    '-': lambda first, second: first - second,
+    '*': lambda first, second: first * second,
+    '/': Fraction,
+    '//': lambda first, second: first // second,
+}
+
+
+def _parse_problem(problem):
     """
-    Takes in a string containing addition & substraction problems,
-    breaks them into separate problems, stacks them vertically, and solves them.
+    Validates a single problem and solves it
 
     Args:
-    :str - problems: a string containing addition & substraction problems
-    :boolean - show_answers: a boolean indicator to notify if the problems
-    or not
+    :str - problem: an addition or substraction problem such as '32 + 698'
+
+    Returns:
+    :tuple - the 1st operand, the operator, the 2nd operand and the answer
+
+    Raises:
+    :ValueError - with the error message of the first rule the problem breaks
     """
+    # Splitting each part in the problem
+    problem_parts = problem.split()
 
-    # Checking if the number of problems given is less than 5
-    if len(problems) > 5:
-        show_answers = False
-        return "Error: Too many problems."
+    # Making sure if the problem is exactly in 3 parts
+    if len(problem_parts) != 3:
+        raise ValueError("Error: Invalid problem format")
 
-    # Storing the list of 1st operand
-    first_operands = []
-    # Storing the list of 2nd operand
-    second_operands = []
-    # Storing the list of operators
-    operators = []
-    # Storing the list of answers
-    answers = []
+    # Storing the parts of the problem
+    first_number, operator, second_number = problem_parts
 
-    # Looping through each problem in the list
-    for problem in problems:
-        # Splitting each part in the problem
-        problem_parts = problem.split()
-
-        # Making sure if the problem is exactly in 3 parts
-        if len(problem_parts) != 3:
-            show_answers = False
-            return "Error: Invalid problem format"
-
-        # Storing the parts of the problem
-        first_number, operator, second_number = problem_parts
-
-        # Making sure there were only '+' and '-' operators
-        allowed_operators = ['+', '-']
-        if operator not in allowed_operators:
-            show_answers = False
-            return "Error: Operator must be '+' or '-'."
-
-        # Making sure the 1st and 2nd operands are digits
-        if not first_number.isdigit() or not second_number.isdigit():
-            show_answers = False
-            return "Error: Numbers must only contain digits."
-
-        # Making sure 1st and 2nd operands are not bigger than 4 digits
-        if len(first_number) > 4 or len(second_number) > 4:
-            show_answers = False
-            return "Error: Numbers cannot be more than four digits."
-
-        # Adding the 1st operand to the 1st operands list
-        first_operands.append(first_number)
-        # Adding the 2nd operand to the 2nd operands list
-        second_operands.append(second_number)
-        # Adding operator to the operators list
-        operators.append(operator)
-
-        # Do addition or subtraction
-        if operator == '+':
-            answer = str(int(first_number) + int(second_number))
-        else:
-            answer = str(int(first_number) - int(second_number))
-
-        # Adding answer to the answers list
-        answers.append(answer)
+    # Making sure there were only '+' and '-' operators
+    allowed_operators = ['+', '-']
+    if operator not in allowed_operators:
+        raise ValueError("Error: Operator must be '+' or '-'.")
+
+    # Making sure the 1st and 2nd operands are digits
+    if not first_number.isdigit() or not second_number.isdigit():
+        raise ValueError("Error: Numbers must only contain digits.")
+
+    # Making sure 1st and 2nd operands are not bigger than 4 digits
+    if len(first_number) > 4 or len(second_number) > 4:
+        raise ValueError("Error: Numbers cannot be more than four digits.")
+
+    # Do addition or subtraction
+    if operator == '+':
+        answer = str(int(first_number) + int(second_number))
+    else:
+        answer = str(int(first_number) - int(second_number))
+
+    return first_number, operator, second_number, answer
+
+
+def _parse_extended_problem(problem):
+    """
+    Validates a single problem of the extended mode and solves it.
+    Operands can be any length and '*', '/' and '//' are allowed too.
+
+    Args:
+    :str - problem: an arithmetic problem such as '1234567 * 89'
 
+    Returns:
+    :tuple - the 1st operand, the operator, the 2nd operand and the answer
+
+    Raises:
+    :ValueError - with the error message of the first rule the problem breaks
+    """
+    # Splitting each part in the problem
+    problem_parts = problem.split()
+
+    # Making sure if the problem is exactly in 3 parts
+    if len(problem_parts) != 3:
+        raise ValueError("Error: Invalid problem format")
+
+    # Storing the parts of the problem
+    first_number, operator, second_number = problem_parts
+
+    # Making sure the operator is one the extended mode supports
+    if operator not in EXTENDED_OPERATORS:
+        raise ValueError("Error: Operator must be '+', '-', '*', '/' or '//'.")
+
+    # Making sure the 1st and 2nd operands are digits
+    if not first_number.isdigit() or not second_number.isdigit():
+        raise ValueError("Error: Numbers must only contain digits.")
+
+    # Making sure the problem doesn't divide by zero
+    if operator in ('/', '//') and int(second_number) == 0:
+        raise ValueError("Error: Division by zero.")
+
+    # Solving with Python's arbitrary-precision integers, and an exact
+    # fraction such as '7/2' for true division
+    answer = str(EXTENDED_OPERATORS[operator](int(first_number), int(second_number)))
+
+    return first_number, operator, second_number, answer
+
+
+def _arrange_row(parsed_problems, show_answers):
+    """
+    Stacks a row of already validated problems vertically
+
+    Args:
+    :list - parsed_problems: tuples returned by _parse_problem()
+    :boolean - show_answers: a boolean indicator to notify if the answers
+    are shown or not
+
+    Returns:
+    :str - the arranged problems
+    """
+    return '\n'.join(_arrange_lines(parsed_problems, show_answers))
+
+
+def _arrange_lines(parsed_problems, show_answers):
+    """
+    Stacks a row of already validated problems vertically, line by line
+
+    Args:
+    :list - parsed_problems: tuples returned by _parse_problem()
+    :boolean - show_answers: a boolean indicator to notify if the answers
+    are shown or not
+
+    Returns:
+    :list - the lines of the arranged problems
+    """
     # Creating a list for arranging the problems
     arranged_problems = []
     # Creating a list of top row
@@ -81,19 +145,22 @@ def arithmetic_arranger(problems, show_answers=False):
     # Creating a list of answer row
     answer_row = []
 
-    # Looping through the length of the problem string
-    for i in range(len(problems)):
-        # Storing the length from the 1st operand to 2nd operand(with 2 space padding)
-        width = max(len(first_operands[i]), len(second_operands[i])) + 2
+    # Looping through each problem in the row
+    for first_number, operator, second_number, answer in parsed_problems:
+        # Storing the length from the 1st operand to 2nd operand(with 2 space padding),
+        # widened for longer operators and for answers longer than the operands
+        width = max(len(first_number), len(second_number) + len(operator) - 1) + 2
+        if show_answers:
+            width = max(width, len(answer))
         # Storing the right alignment based on the width in the top row(1st operand)
-        top_row.append(first_operands[i].rjust(width))
+        top_row.append(first_number.rjust(width))
         # Storing the right alignment based on operator and width in the 
         # bottom row(2nd operand + operator)
-        bottom_row.append(operators[i] + ' ' + second_operands[i].rjust(width - 2))
+        bottom_row.append(operator + ' ' + second_number.rjust(width - len(operator) - 1))
         # Adding up the number of dashes based on the width in the dash_row list
         dash_row.append('-' * width)
         # Adding the calculated answer based on the width length to the answers list
-        answer_row.append(answers[i].rjust(width))
+        answer_row.append(answer.rjust(width))
 
     # Adding the top row(1st operand) with 5 padding spaces
     arranged_problems.append('   '.join(top_row))
@@ -106,7 +173,136 @@ def arithmetic_arranger(problems, show_answers=False):
     if show_answers:
         arranged_problems.append('    '.join(answer_row))
 
-    # Reassigning the problem list with newly arranged problems w/ answers
-    problems = '\n'.join(arranged_problems)
+    return arranged_problems
+
+
+def arithmetic_arranger(problems, show_answers=False, extended=False):
+    """
+    Takes in a string containing addition & substraction problems,
+    breaks them into separate problems, stacks them vertically, and solves them.
+
+    Args:
+    :str - problems: a string containing addition & substraction problems
+    :boolean - show_answers: a boolean indicator to notify if the problems
+    or not
+    :boolean - extended: allow '*', '/' and '//' and operands of any length
+    """
+
+    # Checking if the number of problems given is less than 5
+    if len(problems) > MAX_PROBLEMS:
+        return "Error: Too many problems."
+
+    # Validating and solving every problem before laying any of them out
+    try:
+        parse = _parse_extended_problem if extended else _parse_problem
+        parsed_problems = [parse(problem) for problem in problems]
+    except ValueError as error:
+        return str(error)
+
+    return _arrange_row(parsed_problems, show_answers)
+
+
+def _parsed_rows(problems, per_row, extended):
+    """
+    Validates and solves problems as they are read, grouping them into
+    rows of per_row problems
+
+    Args:
+    :iterable - problems: arithmetic problems
+    :int - per_row: number of problems stacked side by side in a row
+    :boolean - extended: allow '*', '/' and '//' and operands of any length
+
+    Yields:
+    :list - the parsed problems of each row
+
+    Raises:
+    :ValueError - with the same error message arithmetic_arranger() returns
+    """
+    parse = _parse_extended_problem if extended else _parse_problem
+    row = []
+    for problem in problems:
+        row.append(parse(problem))
+        # Handing out the row as soon as it is full
+        if len(row) == per_row:
+            yield row
+            row = []
+
+    # Handing out the last, partly filled row
+    if row:
+        yield row
+
+
+def arrange_batches(problems, per_row=MAX_PROBLEMS, show_answers=False, extended=False):
+    """
+    Lays out any number of problems, a row of per_row problems at a time.
+    Each problem is validated and solved as it is read, so only one row
+    is held in memory however long the input is.
+
+    Args:
+    :iterable - problems: addition & substraction problems
+    :int - per_row: number of problems stacked side by side in a row
+    :boolean - show_answers: a boolean indicator to notify if the answers
+    are shown or not
+    :boolean - extended: allow '*', '/' and '//' and operands of any length
+
+    Yields:
+    :str - the arranged problems of each row
+
+    Raises:
+    :ValueError - with the same error message arithmetic_arranger() returns
+    """
+    for row in _parsed_rows(problems, per_row, extended):
+        yield _arrange_row(row, show_answers)
+
+
+def write_worksheet(problems, stream, per_row=MAX_PROBLEMS, show_answers=False,
+                    extended=False, chunk_size=WRITE_CHUNK_SIZE):
+    """
+    Writes any number of problems straight to a text stream such as an
+    open file or socket file, a row of per_row problems at a time with a
+    blank line between rows. Lines are buffered into chunks of about
+    chunk_size characters, so memory stays bounded however long the input is.
+
+    Args:
+    :iterable - problems: arithmetic problems
+    :file - stream: writable text stream
+    :int - per_row: number of problems stacked side by side in a row
+    :boolean - show_answers: a boolean indicator to notify if the answers
+    are shown or not
+    :boolean - extended: allow '*', '/' and '//' and operands of any length
+    :int - chunk_size: number of characters to buffer before each write
+
+    Returns:
+    :tuple - the number of problems written and problems written per second
+
+    Raises:
+    :ValueError - with the same error message arithmetic_arranger() returns
+    """
+    start = time.perf_counter()
+    count = 0
+    buffer = []
+    buffered = 0
+
+    for row in _parsed_rows(problems, per_row, extended):
+        # Separating rows with a blank line
+        lines = _arrange_lines(row, show_answers)
+        if count:
+            lines.insert(0, '')
+        count += len(row)
+        for line in lines:
+            buffer.append(line + '\n')
+            buffered += len(line) + 1
+
+        # Writing the buffered lines out once there is a chunk of them
+        if buffered >= chunk_size:
+            stream.write(''.join(buffer))
+            buffer = []
+            buffered = 0
+
+    # Writing out what is left in the buffer
+    if buffer:
+        stream.write(''.join(buffer))
+
+    elapsed = time.perf_counter() - start
 
-    return problems
+    return count, count / elapsed if elapsed else float('inf')
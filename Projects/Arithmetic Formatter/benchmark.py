@@ -0,0 +1,86 @@
+'''
+Micro-benchmark of the step by step problem parser against validating
+with a precompiled pattern instead. The pattern is no faster (the int
+conversions dominate and str.split is already cheap), so the module
+keeps the step by step parser and the pattern only lives here.
+'''
+
+import argparse
+import random
+import re
+import time
+
+from Arithmetic_Formatter import _parse_problem
+
+# A valid problem: two operands of at most 4 digits around '+' or '-'
+PROBLEM_PATTERN = re.compile(r"(\d{1,4})\s+([+-])\s+(\d{1,4})")
+
+
+def generate_problems(count, seed=0):
+    """
+    Generates random valid problems
+
+    Args:
+    :int - count: number of problems to generate
+    :int - seed: seed for the random problems
+
+    Returns:
+    :list - problems such as '32 + 698'
+    """
+    rng = random.Random(seed)
+
+    return [f"{rng.randint(0, 9999)} {rng.choice('+-')} {rng.randint(0, 9999)}"
+            for _ in range(count)]
+
+
+def parse_problem_with_pattern(problem):
+    """
+    Validates and solves a problem with a single match of PROBLEM_PATTERN,
+    falling back to the step by step parser for the error message
+
+    Args:
+    :str - problem: an addition or substraction problem such as '32 + 698'
+
+    Returns:
+    :tuple - the 1st operand, the operator, the 2nd operand and the answer
+    """
+    match = PROBLEM_PATTERN.fullmatch(problem)
+    if match is None:
+        return _parse_problem(problem)
+
+    first_number, operator, second_number = match.groups()
+    if operator == '+':
+        answer = str(int(first_number) + int(second_number))
+    else:
+        answer = str(int(first_number) - int(second_number))
+
+    return first_number, operator, second_number, answer
+
+
+def time_parser(parser, problems):
+    """
+    Times a parser over every problem
+
+    Args:
+    :function - parser: parser to time
+    :list - problems: problems to parse
+
+    Returns:
+    :float - seconds taken
+    """
+    start = time.perf_counter()
+    for problem in problems:
+        parser(problem)
+
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--problems", type=int, default=10 ** 6)
+    args = parser.parse_args()
+
+    problems = generate_problems(args.problems)
+    for name, function in [("step by step", _parse_problem), ("regex", parse_problem_with_pattern)]:
+        elapsed = time_parser(function, problems)
+        print(f"{name:>12}: {elapsed:6.2f}s ({len(problems) / elapsed:12,.0f} problems/s)")
@@ -1,5 +1,6 @@
+import io
 import unittest
-from Arithmetic_Formatter import arithmetic_arranger
+from Arithmetic_Formatter import arithmetic_arranger, arrange_batches, write_worksheet
 
 class UnitTests(unittest.TestCase):
 
@@ -48,5 +49,34 @@ class UnitTests(unittest.TestCase):
         answer_expected = "   32         1      45      123      988\n- 698    - 3801    + 43    +  49    +  40\n-----    ------    ----    -----    -----\n -666     -3800      88      172     1028"
         self.assertEqual(answer_produced, answer_expected)
 
+    def test_arrange_batches(self):
+        problems = ["32 - 698", "1 - 3801", "45 + 43", "123 + 49", "988 + 40", "3 + 855", "988 + 40"]
+        answer_produced = list(arrange_batches(iter(problems), 5, True))
+        answer_expected = [arithmetic_arranger(problems[:5], True), arithmetic_arranger(problems[5:], True)]
+        self.assertEqual(answer_produced, answer_expected)
+
+    def test_arrange_batches_error(self):
+        with self.assertRaisesRegex(ValueError, "Error: Operator must be '\\+' or '-'."):
+            list(arrange_batches(["3 + 855"] * 10 + ["3 / 855"]))
+
+    def test_extended(self):
+        answer_produced = arithmetic_arranger(["12345 * 678", "7 / 2", "99 // 4", "123456789 + 1"], True, extended=True).split("\n")[1:]
+        answer_expected = ["*   678    / 2    // 4    +         1", "-------    ---    ----    -----------", "8369910    7/2      24      123456790"]
+        self.assertEqual(answer_produced, answer_expected)
+
+    def test_extended_errors(self):
+        self.assertEqual(arithmetic_arranger(["3 % 2"], extended=True), "Error: Operator must be '+', '-', '*', '/' or '//'.")
+        self.assertEqual(arithmetic_arranger(["3 // 0"], extended=True), "Error: Division by zero.")
+        self.assertEqual(arithmetic_arranger(["3 * 2"]), "Error: Operator must be '+' or '-'.")
+
+    def test_write_worksheet(self):
+        problems = ["32 - 698", "1 - 3801", "45 + 43", "123 + 49", "988 + 40", "3 + 855", "988 + 40"]
+        stream = io.StringIO()
+        count, rate = write_worksheet(iter(problems), stream, 3, True, chunk_size=16)
+        answer_expected = "\n\n".join(arrange_batches(problems, 3, True)) + "\n"
+        self.assertEqual(stream.getvalue(), answer_expected)
+        self.assertEqual(count, 7)
+        self.assertGreater(rate, 0)
+
 if __name__ == "__main__":
     unittest.main()
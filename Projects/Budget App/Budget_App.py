@@ -1,5 +1,288 @@
 '''Building a Budget app project'''
 
+from array import array
+from bisect import bisect_left, bisect_right
+import csv
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+import heapq
+import itertools
+import json
+import mmap
+import re
+import struct
+import threading
+
+# Header of a saved ledger file: magic bytes, entry count,
+# number of strings and string table size
+LEDGER_MAGIC = b"LEDGER02"
+CENTS_LEDGER_MAGIC = b"LEDGERC2"
+LEDGER_HEADER = struct.Struct("<8sQQQ")
+
+CENTS_PER_UNIT = 100
+ONE_CENT = Decimal("0.01")
+
+# Number of imported entries appended to a ledger at a time
+IMPORT_BATCH_SIZE = 10000
+RECORD_FIELDS = ["amount", "description"]
+
+# Most entries added to the amount index one at a time; more are
+# sorted and merged into it in a single pass
+INDEX_INSERT_LIMIT = 64
+
+# Words of a description that the description index is keyed on
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Giving every category a rank, so transfers always lock in the same order
+_lock_ranks = itertools.count()
+
+
+def to_cents(amount) -> int:
+    """
+    Converting an amount of money to a whole number of cents, rounding
+    the amount as written (so 1.005 is 1.01) rather than its binary float
+
+    Args:
+        :amount float: amount of money
+
+    Returns:
+        :int: amount in cents
+    """
+    cents = Decimal(str(amount)).quantize(ONE_CENT, rounding=ROUND_HALF_UP)
+
+    return int(cents * CENTS_PER_UNIT)
+
+
+def read_records(file, fmt="csv"):
+    """
+    Streaming ledger entries out of a CSV or JSON Lines file one at a time
+
+    Args:
+        :file file: open text file with "amount" and "description" fields
+        :fmt str: "csv" or "jsonl"
+
+    Yields:
+        :dict: amount and description of each entry
+    """
+    if fmt == "csv":
+        rows = csv.DictReader(file)
+    elif fmt == "jsonl":
+        rows = (json.loads(line) for line in file if line.strip())
+    else:
+        raise ValueError(f"Unknown record format: {fmt}")
+
+    for row in rows:
+        yield {"amount": float(row["amount"]), "description": row.get("description") or ""}
+
+
+class ColumnarLedger:
+    '''
+    A compact ledger that can stand in for the list of dictionaries:
+    -> Amounts are stored in a flat array of doubles
+    -> Descriptions are interned into a string table and stored as indexes
+    -> ledger[i] still builds the {"amount", "description"} dictionary
+    -> Can be saved to a file and memory-mapped back without parsing entries
+    -> Can store amounts as whole cents, converted back only when read
+    '''
+
+    def __init__(self, cents=False):
+        """
+        Creating an empty ledger with its amount and description columns
+
+        :param cents: bool, store amounts as integer cents instead of floats
+        :return: None
+        """
+        self.cents = cents
+        self._typecode = 'q' if cents else 'd'
+        self._amounts = array(self._typecode)
+        self._description_ids = array('I')
+        # Storing each distinct description once
+        self._strings = []
+        self._string_ids = {}
+        # Memory map backing the columns of a loaded ledger, if any
+        self._mmap = None
+
+    def __len__(self):
+        return len(self._amounts)
+
+    def __getstate__(self):
+        """
+        Copying memory-mapped columns out when the ledger is pickled
+        or copied, since the memory map itself can't be
+
+        Returns:
+            :dict: the ledger's attributes with its columns as arrays
+        """
+        state = self.__dict__.copy()
+        if self._mmap is not None:
+            state["_amounts"] = self.amounts()
+            state["_description_ids"] = array('I', self._description_ids.tobytes())
+            state["_mmap"] = None
+
+        return state
+
+    def __getitem__(self, index):
+        """
+        Building the ledger entry (or entries for a slice) at an index
+
+        Args:
+            :index int or slice: position of the entry
+
+        Returns:
+            :dict: amount and description of the entry
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        amount = self._amounts[index]
+        if self.cents:
+            amount /= CENTS_PER_UNIT
+
+        return {"amount": amount,
+                "description": self._strings[self._description_ids[index]]}
+
+    def __iter__(self):
+        strings = self._strings
+        for amount, string_id in zip(self._amounts, self._description_ids):
+            if self.cents:
+                amount /= CENTS_PER_UNIT
+            yield {"amount": amount, "description": strings[string_id]}
+
+    def _intern(self, desc) -> int:
+        """
+        Getting the string table index of a description, adding it if new
+
+        Args:
+            :desc str: description to look up
+
+        Returns:
+            :int: index of the description in the string table
+        """
+        string_id = self._string_ids.get(desc)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(desc)
+            self._string_ids[desc] = string_id
+
+        return string_id
+
+    def _make_writable(self) -> None:
+        """
+        Copying memory-mapped columns into arrays before the first change
+        """
+        if self._mmap is None:
+            return
+        amounts = array(self._typecode, self._amounts.tobytes())
+        description_ids = array('I', self._description_ids.tobytes())
+        # Releasing the views so the memory map can be closed
+        self._amounts.release()
+        self._description_ids.release()
+        self._mmap.close()
+        self._mmap = None
+        self._amounts = amounts
+        self._description_ids = description_ids
+
+    def append(self, entry) -> None:
+        """
+        Adding a ledger entry to the columns
+
+        Args:
+            :entry dict: amount and description of the entry
+        """
+        self._make_writable()
+        amount = entry["amount"]
+        self._amounts.append(to_cents(amount) if self.cents else amount)
+        self._description_ids.append(self._intern(entry["description"]))
+
+    def extend(self, entries) -> None:
+        """
+        Adding several ledger entries to the columns
+
+        Args:
+            :entries iterable: amount and description dictionaries
+        """
+        for entry in entries:
+            self.append(entry)
+
+    def amounts(self):
+        """
+        Getting the amount column without building any dictionaries.
+        The column of a loaded ledger is copied out of its memory map.
+
+        Returns:
+            :array: amounts of every entry in the ledger (in cents
+            for a cents ledger)
+        """
+        if self._mmap is not None:
+            return array(self._typecode, self._amounts.tobytes())
+
+        return self._amounts
+
+    def save(self, path) -> None:
+        """
+        Writing the ledger columns and string table to a file
+
+        Args:
+            :path str: file to write the ledger to
+        """
+        # Copying the columns out of the file they may be mapped from,
+        # since that file may be the one about to be overwritten
+        self._make_writable()
+        encoded = [desc.encode("utf-8") for desc in self._strings]
+        # Storing the length of every string, so any character can be in one
+        string_lengths = array('I', map(len, encoded))
+        string_table = b"".join(encoded)
+        with open(path, "wb") as file:
+            magic = CENTS_LEDGER_MAGIC if self.cents else LEDGER_MAGIC
+            file.write(LEDGER_HEADER.pack(magic, len(self), len(encoded), len(string_table)))
+            file.write(self._amounts.tobytes())
+            file.write(self._description_ids.tobytes())
+            file.write(string_lengths.tobytes())
+            file.write(string_table)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-mapping a ledger written by save(), so the amount
+        and description columns are used in place without parsing
+
+        Args:
+            :path str: file to read the ledger from
+
+        Returns:
+            :ColumnarLedger: ledger backed by the file
+        """
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, string_count, table_size = LEDGER_HEADER.unpack_from(mapped)
+        if magic not in (LEDGER_MAGIC, CENTS_LEDGER_MAGIC):
+            mapped.close()
+            raise ValueError(f"{path} is not a saved ledger")
+        ledger = cls(cents=magic == CENTS_LEDGER_MAGIC)
+
+        view = memoryview(mapped)
+        start = LEDGER_HEADER.size
+        ids_start = start + count * 8
+        lengths_start = ids_start + count * 4
+        table_start = lengths_start + string_count * 4
+        ledger._amounts = view[start:ids_start].cast(ledger._typecode)
+        ledger._description_ids = view[ids_start:lengths_start].cast('I')
+        string_lengths = array('I', view[lengths_start:table_start].tobytes())
+        view.release()
+        ledger._mmap = mapped
+
+        # Rebuilding the string table, the only part read eagerly
+        string_table = mapped[table_start:table_start + table_size]
+        ledger._strings = []
+        offset = 0
+        for length in string_lengths:
+            ledger._strings.append(string_table[offset:offset + length].decode("utf-8"))
+            offset += length
+        ledger._string_ids = {desc: i for i, desc in enumerate(ledger._strings)}
+
+        return ledger
+
+
 
 class Category:
     '''
@@ -12,34 +295,144 @@ class Category:
     category
     '''
 
-    def __init__(self, s):
+    def __init__(self, s, ledger=None, cents=False):
         """
         Creating a Category class with a constructor 
         that takes in a category name and creates a ledger 
         list to store the amounts of each deposit or withdrawal.
 
         :param s: str
+        :param ledger: optional ledger to use instead of a new list,
+            such as a ColumnarLedger
+        :param cents: bool, keep the balance and withdrawals in integer
+            cents so they add up exactly
         :return: None
         """
         # Creating a Category class with a constructor
         self.category = s
         # Creating a ledger list to store the amounts of each deposit or withdrawal
-        self.ledger = []
+        self.ledger = [] if ledger is None else ledger
+        self.cents = cents
+        # Guarding the ledger and running totals against concurrent changes
+        self._lock = threading.RLock()
+        self._lock_rank = next(_lock_ranks)
+        # Query indexes, only built the first time the ledger is queried
+        self._token_index = None
+        self._amount_keys = None
+        self._amount_positions = None
+        self._indexed_count = 0
+        # Keeping running totals so they don't need re-summing from the ledger
+        self._balance = 0
+        self._withdrawals = 0
+        # Totalling an existing ledger once, from its amount column
+        # when it has one so no entry dictionaries are built
+        amounts = getattr(self.ledger, "amounts", None)
+        if amounts is None:
+            units = (self._to_units(item["amount"]) for item in self.ledger)
+        elif self.ledger.cents == cents:
+            units = amounts()
+        elif cents:
+            units = map(to_cents, amounts())
+        else:
+            units = (amount / CENTS_PER_UNIT for amount in amounts())
+        self._add_to_totals(units)
+
+    def __getstate__(self):
+        """
+        Leaving the lock out when the category is pickled or copied
+
+        Returns:
+            :dict: the category's attributes without its lock
+        """
+        state = self.__dict__.copy()
+        del state["_lock"]
+        del state["_lock_rank"]
+
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restoring a pickled or copied category with a lock of its own
+
+        Args:
+            :state dict: attributes returned by __getstate__()
+        """
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._lock_rank = next(_lock_ranks)
+
+    def _to_units(self, amnt):
+        """
+        Converting an amount to the units the running totals are kept in
+
+        Args:
+            :amnt float: amount of money
+
+        Returns:
+            :int or float: amount in cents in cents mode, else unchanged
+        """
+        return to_cents(amnt) if self.cents else amnt
+
+    def _from_units(self, units) -> float:
+        """
+        Converting a running total back to an amount of money
+
+        Args:
+            :units int or float: total in the units it is kept in
+
+        Returns:
+            :float: amount of money
+        """
+        return units / CENTS_PER_UNIT if self.cents else units
+
+    def _ledger_amount(self, amnt):
+        """
+        Getting the amount a ledger entry records, rounded to the cent
+        in cents mode so the entries match the running totals
+
+        Args:
+            :amnt float: amount of money
+
+        Returns:
+            :float: amount to store in the ledger
+        """
+        return self._from_units(to_cents(amnt)) if self.cents else amnt
+
+    def _add_to_totals(self, amounts) -> None:
+        """
+        Adding amounts appended to the ledger to the running totals,
+        counting every negative one as a withdrawal
+
+        Args:
+            :amounts iterable: amounts in the units the totals are kept in
+        """
+        balance = self._balance
+        withdrawals = self._withdrawals
+        for amount in amounts:
+            balance += amount
+            if amount < 0:
+                withdrawals -= amount
+        self._balance = balance
+        self._withdrawals = withdrawals
 
     def get_balance(self) -> float:
         """
-        Calculating the total amount in the ledger list
+        Getting the total amount in the ledger list, kept up to date
+        by every deposit and withdrawal
         
         Returns:
             :float: total amount in the ledger list
         """
-        total = 0
-        # Going through the ledger list
-        for item in self.ledger:
-            # Adding up sum of the amount
-            total += item["amount"]
+        return self._from_units(self._balance)
 
-        return total
+    def get_withdrawals(self) -> float:
+        """
+        Getting the total amount withdrawn from the category
+
+        Returns:
+            :float: total amount of the withdrawals in the ledger list
+        """
+        return self._from_units(self._withdrawals)
 
     def check_funds(self, amnt) -> bool:
         """
@@ -52,7 +445,7 @@ class Category:
             :bool: True if amount is less than the total amount
         """
         # Checking if the amount is less than the total amount
-        fund_checking = self.get_balance() >= amnt
+        fund_checking = self._balance >= self._to_units(amnt)
 
         return fund_checking
 
@@ -65,8 +458,10 @@ class Category:
             :amount float: amount to be deposited
             :desc str: description of the deposit
         """
-        # Adding a deposit to the ledger list in dictionary form
-        self.ledger.append({"amount": amnt, "description": desc})
+        with self._lock:
+            # Adding a deposit to the ledger list in dictionary form
+            self.ledger.append({"amount": self._ledger_amount(amnt), "description": desc})
+            self._add_to_totals((self._to_units(amnt),))
 
     def withdraw(self, amnt, desc="") -> bool:
         """
@@ -77,15 +472,158 @@ class Category:
             :amount float: amount to be withdrawn
             :desc str: description of the withdrawal
         """
-        # Checking if the amount is less than the total amount
-        if self.check_funds(amnt):
-            # Adding a withdraw to the ledger list in dictionary form
-            # Adding the label of the amount with '-' prefix to indicate withdrawal
-            self.ledger.append({"amount": -amnt, "description": desc})
-            return True
+        with self._lock:
+            # Checking if the amount is less than the total amount
+            if self.check_funds(amnt):
+                # Adding a withdraw to the ledger list in dictionary form
+                # Adding the label of the amount with '-' prefix to indicate withdrawal
+                self.ledger.append({"amount": -self._ledger_amount(amnt), "description": desc})
+                self._add_to_totals((-self._to_units(amnt),))
+                return True
 
         return False
 
+    @classmethod
+    def from_records(cls, s, records, ledger=None, cents=False, strict=False):
+        """
+        Building a category from a stream of ledger entries in one pass.
+        Withdrawals are checked against the running balance like withdraw()
+        does, and entries are appended to the ledger in batches.
+
+        Args:
+            :s str: name of the category
+            :records iterable: amount and description dictionaries,
+                such as the ones yielded by read_records()
+            :ledger: optional empty ledger to fill, such as a ColumnarLedger
+            :cents bool: keep the running totals in integer cents
+            :strict bool: raise instead of skipping a withdrawal
+                the balance can't cover
+
+        Returns:
+            :Category: category holding the imported entries
+        """
+        category = cls(s, ledger, cents)
+        batch = []
+        for record in records:
+            amount = category._to_units(record["amount"])
+            if amount < 0:
+                # Skipping withdrawals without funds, as withdraw() would
+                if category._balance < -amount:
+                    if strict:
+                        raise ValueError(f"Insufficient funds for {record}")
+                    continue
+            category._add_to_totals((amount,))
+            batch.append({"amount": category._ledger_amount(record["amount"]),
+                          "description": record.get("description", "")})
+            # Handing full batches to the ledger to keep memory flat
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                category.ledger.extend(batch)
+                batch = []
+        category.ledger.extend(batch)
+
+        return category
+
+    def write_records(self, file, fmt="csv") -> None:
+        """
+        Streaming the ledger entries out to a CSV or JSON Lines file
+
+        Args:
+            :file file: open text file to write to
+            :fmt str: "csv" or "jsonl"
+        """
+        if fmt == "csv":
+            writer = csv.DictWriter(file, fieldnames=RECORD_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.ledger)
+        elif fmt == "jsonl":
+            for item in self.ledger:
+                file.write(json.dumps(item) + "\n")
+        else:
+            raise ValueError(f"Unknown record format: {fmt}")
+
+    def _update_indexes(self) -> None:
+        """
+        Building the description and amount indexes on first use, then
+        adding only the entries appended since the last query
+        """
+        building = self._token_index is None
+        if building:
+            self._token_index = {}
+            self._amount_keys = []
+            self._amount_positions = []
+        new_entries = []
+        for position in range(self._indexed_count, len(self.ledger)):
+            item = self.ledger[position]
+            # Listing every position under each word of its description
+            for token in set(TOKEN_PATTERN.findall(item["description"].lower())):
+                self._token_index.setdefault(token, []).append(position)
+            new_entries.append((item["amount"], position))
+        self._indexed_count = len(self.ledger)
+
+        if building:
+            # Sorting the whole ledger once when the index is first built
+            new_entries.sort()
+            self._amount_keys = [amount for amount, _ in new_entries]
+            self._amount_positions = [position for _, position in new_entries]
+        elif len(new_entries) <= INDEX_INSERT_LIMIT:
+            # Inserting a few new entries at their place in the sorted amounts
+            for amount, position in new_entries:
+                index = bisect_right(self._amount_keys, amount)
+                self._amount_keys.insert(index, amount)
+                self._amount_positions.insert(index, position)
+        else:
+            # Merging many new entries in one pass instead of shifting
+            # the whole index for every one of them
+            new_entries.sort()
+            merged = list(heapq.merge(zip(self._amount_keys, self._amount_positions), new_entries))
+            self._amount_keys = [amount for amount, _ in merged]
+            self._amount_positions = [position for _, position in merged]
+
+    def query(self, text=None, min_amount=None, max_amount=None) -> list:
+        """
+        Finding the ledger entries whose description contains every
+        word of text and whose amount is within the given range, e.g.
+        withdrawals over 100 for rent: query("rent", max_amount=-100)
+
+        Args:
+            :text str: words the description must contain
+            :min_amount float: lowest amount to include
+            :max_amount float: highest amount to include
+
+        Returns:
+            :list: matching ledger entries in ledger order
+        """
+        with self._lock:
+            self._update_indexes()
+            matches = None
+
+            # Intersecting the positions listed under each word
+            if text is not None:
+                for token in set(TOKEN_PATTERN.findall(text.lower())):
+                    positions = set(self._token_index.get(token, ()))
+                    matches = positions if matches is None else matches & positions
+
+            # Finding the positions in the amount range by binary search
+            if min_amount is not None or max_amount is not None:
+                low = 0 if min_amount is None else bisect_left(self._amount_keys, min_amount)
+                high = (len(self._amount_keys) if max_amount is None
+                        else bisect_right(self._amount_keys, max_amount))
+                if matches is None:
+                    matches = set(self._amount_positions[low:high])
+                elif len(matches) < high - low:
+                    # Checking the amounts of the fewer word matches directly
+                    matches = {position for position in matches
+                               if (min_amount is None or self.ledger[position]["amount"] >= min_amount)
+                               and (max_amount is None or self.ledger[position]["amount"] <= max_amount)}
+                else:
+                    matches = {position for position in self._amount_positions[low:high]
+                               if position in matches}
+
+            if matches is None:
+                matches = range(len(self.ledger))
+
+            return [self.ledger[position] for position in sorted(matches)]
+
     def transfer(self, amnt, catgry) -> bool:
         """
         Adding a dictionary to the ledger list with the amount
@@ -98,13 +636,17 @@ class Category:
         Returns:
             :bool: True if amount is transferred
         """
-        # Checking if the amount transferred is less than the total amount
-        if self.check_funds(amnt):
-            # Calling withdrawal and deposit methods to transfer the amount
-            self.withdraw(amnt, f"Transfer to {catgry.category}")
-            catgry.deposit(amnt, f"Transfer from {self.category}")
-
-            return True
+        # Locking both categories, lowest rank first, so two transfers
+        # between the same pair can never wait on each other
+        first, second = sorted((self, catgry), key=lambda cat: cat._lock_rank)
+        with first._lock, second._lock:
+            # Checking if the amount transferred is less than the total amount
+            if self.check_funds(amnt):
+                # Calling withdrawal and deposit methods to transfer the amount
+                self.withdraw(amnt, f"Transfer to {catgry.category}")
+                catgry.deposit(amnt, f"Transfer from {self.category}")
+
+                return True
 
         return False
 
@@ -139,56 +681,54 @@ def create_spend_chart(catgries: list) -> str:
     Returns:
         :chart str: bar chart showing the percentage of money spent
     """
-    chart = "Percentage spent by category\n"
-
-    # Getting the total amount of money spent
-    withdrawals = []
-    for cat in catgries:
-        total_withdrawal = 0
-        for i in cat.ledger:
-            amount = i["amount"]
-            if amount < 0:
-                total_withdrawal += amount
-        withdrawals.append(-total_withdrawal)
+    # Reading the withdrawal totals each category keeps up to date,
+    # so a chart for unchanged categories comes straight from the cache
+    spending = tuple((cat.category, cat.get_withdrawals()) for cat in catgries)
+
+    return _render_spend_chart(spending)
+
+
+@lru_cache(maxsize=256)
+def _render_spend_chart(spending: tuple) -> str:
+    """
+    Drawing the bar chart for the given category names and withdrawal
+    totals. Any ledger change alters the totals, so a cached chart is
+    never reused after its categories change.
+
+    Args:
+        :spending tuple: (category name, total withdrawn) pairs
+
+    Returns:
+        :chart str: bar chart showing the percentage of money spent
+    """
+    rows = ["Percentage spent by category"]
+
+    # Getting the total amount of money spent once
+    total_spent = sum(withdrawn for _, withdrawn in spending)
 
     # Getting the percentages of money spent
-    percent_withrawals = []
-    for i in withdrawals:
-        percentage = round(i / sum(withdrawals) * 100)
-        percent_withrawals.append(percentage)
+    percent_withrawals = [round(withdrawn / total_spent * 100)
+                          for _, withdrawn in spending]
 
     # Getting the names of the categories
-    names = []
-    for cat in catgries:
-        name = cat.category.lower().capitalize()
-        names.append(name)
+    names = [name.lower().capitalize() for name, _ in spending]
 
     # Creating the bar chart
     # Adding y-axis
     for i in range(100, -10, -10):
-        chart += str(i).rjust(3) + "| "
-        for percent in percent_withrawals:
-            if percent >= i:
-                chart += "o  "
-            else:
-                chart += "   "
-        chart += "\n"
+        bars = "".join("o  " if percent >= i else "   " for percent in percent_withrawals)
+        rows.append(str(i).rjust(3) + "| " + bars)
 
     # Adding x-axis
-    chart += (" " * 4) + ("-" * (3 * (len(catgries)) + 1))
+    rows.append((" " * 4) + ("-" * (3 * (len(spending)) + 1)))
     max_length = len(max(names, key=len))
-    axis_names = []
-    for i in names:
-        adj_spacing = i.ljust(max_length)
-        axis_names.append(adj_spacing)
+    axis_names = [name.ljust(max_length) for name in names]
 
     # Adding x-axis labels
     for i in range(max_length):
-        chart += "\n     "
-        for name in axis_names:
-            chart += name[i] + "  "
+        rows.append("     " + "".join(name[i] + "  " for name in axis_names))
 
-    return chart
+    return "\n".join(rows)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+'''Stress benchmark for concurrent transfers between Budget categories'''
+
+import argparse
+import random
+import threading
+import time
+
+from Budget_App import Category
+
+
+def run_transfers(num_categories, num_threads, transfers_per_thread, seed=0):
+    """
+    Running random transfers between categories from several threads
+    and checking that no money was created or lost
+
+    Args:
+        :num_categories int: number of categories to transfer between
+        :num_threads int: number of threads doing transfers
+        :transfers_per_thread int: number of transfers each thread attempts
+        :seed int: seed for the random transfers
+
+    Returns:
+        :float: transfers attempted per second
+    """
+    categories = [Category(f"Category {i}", cents=True) for i in range(num_categories)]
+    for cat in categories:
+        cat.deposit(1000, "initial deposit")
+    expected_total = 1000 * num_categories
+
+    def worker(thread_seed):
+        rng = random.Random(thread_seed)
+        for _ in range(transfers_per_thread):
+            source, target = rng.sample(categories, 2)
+            source.transfer(rng.randint(1, 300), target)
+
+    threads = [threading.Thread(target=worker, args=(seed + i,)) for i in range(num_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # Checking that the balances were conserved and never overdrawn
+    total = sum(cat.get_balance() for cat in categories)
+    if total != expected_total:
+        raise AssertionError(f"Balances not conserved: {total} != {expected_total}")
+    for cat in categories:
+        if cat.get_balance() < 0:
+            raise AssertionError(f"{cat.category} was overdrawn")
+
+    return num_threads * transfers_per_thread / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--categories", type=int, default=100)
+    parser.add_argument("--transfers", type=int, default=5000,
+                        help="transfers attempted by each thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    for threads in args.threads:
+        rate = run_transfers(args.categories, threads, args.transfers)
+        print(f"{threads:>3} threads: {rate:12,.0f} transfers/s (balances conserved)")
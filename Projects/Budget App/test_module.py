@@ -1,3 +1,9 @@
+import copy
+import io
+import pickle
+import os
+import tempfile
+import threading
 import unittest
 import Budget_App
 from Budget_App import create_spend_chart
@@ -55,6 +61,149 @@ class TestBudgetApp(unittest.TestCase):
         expected = {"amount": 20, "description": "Transfer from Food"}
         self.assertEqual(actual, expected, 'Expected `transfer` method to create a specific ledger item in entertainment object.')
 
+    def test_get_withdrawals(self):
+        self.food.deposit(900, "deposit")
+        self.food.withdraw(45.67, "milk, cereal, eggs, bacon, bread")
+        self.food.transfer(20, self.entertainment)
+        self.food.withdraw(1000, "too much")
+        actual = self.food.get_withdrawals()
+        expected = 65.67
+        self.assertAlmostEqual(actual, expected, msg='Expected withdrawals to be 65.67')
+        self.assertEqual(self.food.get_balance(), sum(item["amount"] for item in self.food.ledger), 'Expected running balance to match the ledger.')
+
+    def test_get_withdrawals_signs(self):
+        self.food.deposit(100, "deposit")
+        self.food.deposit(-30, "refund reversal")
+        self.food.withdraw(-5, "negative withdrawal")
+        self.assertEqual(self.food.get_withdrawals(), 30, 'Expected only negative ledger amounts to count as withdrawals.')
+        reloaded = Budget_App.Category("Food", ledger=self.food.ledger)
+        self.assertEqual(reloaded.get_withdrawals(), self.food.get_withdrawals(), 'Expected the same withdrawals after reloading the ledger.')
+        self.assertEqual(reloaded.get_balance(), self.food.get_balance(), 'Expected the same balance after reloading the ledger.')
+
+    def test_columnar_ledger(self):
+        food = Budget_App.Category("Food", Budget_App.ColumnarLedger())
+        food.deposit(900, "deposit")
+        food.withdraw(45.67, "milk, cereal, eggs, bacon, bread")
+        expected = {"amount": -45.67, "description": "milk, cereal, eggs, bacon, bread"}
+        self.assertEqual(food.ledger[1], expected, 'Expected columnar ledger to build the same ledger entries.')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "food.ledger")
+            food.ledger.save(path)
+            loaded = Budget_App.Category("Food", Budget_App.ColumnarLedger.load(path))
+            self.assertEqual(list(loaded.ledger), list(food.ledger), 'Expected saved ledger to load back unchanged.')
+            self.assertEqual(loaded.get_balance(), 854.33, 'Expected loaded balance to be 854.33')
+            loaded.withdraw(4.33, "snack")
+            self.assertEqual(loaded.get_balance(), 850, 'Expected loaded ledger to accept new entries.')
+
+    def test_columnar_ledger_save_over_loaded_file(self):
+        ledger = Budget_App.ColumnarLedger()
+        ledger.extend([{"amount": 10, "description": "a\0b"}, {"amount": 5, "description": "c"}])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "food.ledger")
+            ledger.save(path)
+            loaded = Budget_App.ColumnarLedger.load(path)
+            loaded.save(path)
+            actual = [item["description"] for item in Budget_App.ColumnarLedger.load(path)]
+            self.assertEqual(actual, ["a\0b", "c"], 'Expected descriptions with NUL characters to load back unchanged.')
+
+    def test_columnar_ledger_copy(self):
+        ledger = Budget_App.ColumnarLedger(cents=True)
+        ledger.extend([{"amount": 10.25, "description": "deposit"}, {"amount": -4.1, "description": "snack"}])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "food.ledger")
+            ledger.save(path)
+            loaded = Budget_App.Category("Food", Budget_App.ColumnarLedger.load(path))
+            self.assertEqual(type(loaded.ledger.amounts()), type(ledger.amounts()), 'Expected amounts() to return the same type for a loaded ledger.')
+            self.assertEqual(loaded.get_withdrawals(), 4.1, 'Expected withdrawals to be totalled from the amount column.')
+            for copied in (copy.deepcopy(loaded), pickle.loads(pickle.dumps(loaded))):
+                self.assertEqual(list(copied.ledger), list(loaded.ledger), 'Expected a copied ledger to hold the same entries.')
+                self.assertEqual(copied.get_balance(), 6.15, 'Expected a copied category to keep its balance.')
+            self.assertEqual(loaded.ledger[1], {"amount": -4.1, "description": "snack"}, 'Expected copying to leave the loaded ledger usable.')
+
+    def test_cents_mode(self):
+        food = Budget_App.Category("Food", cents=True)
+        for _ in range(10):
+            food.deposit(0.1, "dime")
+        food.withdraw(0.3, "gum")
+        self.assertEqual(food.ledger[10], {"amount": -0.3, "description": "gum"}, 'Expected ledger entries to keep the amounts given.')
+        self.assertEqual(food.get_balance(), 0.7, 'Expected cents balance to be exactly 0.7')
+        self.assertEqual(food.check_funds(0.7), True, 'Expected `check_funds` method to be True')
+        self.assertEqual(food.get_withdrawals(), 0.3, 'Expected cents withdrawals to be exactly 0.3')
+
+    def test_cents_mode_rounding(self):
+        food = Budget_App.Category("Food", cents=True)
+        food.deposit(1.005, "deposit")
+        self.assertEqual(food.ledger[0], {"amount": 1.01, "description": "deposit"}, 'Expected ledger entry rounded to the cent.')
+        self.assertEqual(food.get_balance(), 1.01, 'Expected balance to be 1.01')
+        food.withdraw(0.125, "gum")
+        self.assertEqual(food.ledger[1]["amount"], -0.13, 'Expected withdrawal rounded to the cent.')
+        self.assertEqual(food.get_balance(), 0.88, 'Expected balance to be 0.88')
+
+    def test_from_records(self):
+        statement = io.StringIO("amount,description\n900,deposit\n-45.67,groceries\n-1000,rent\n-20,\n")
+        food = Budget_App.Category.from_records("Food", Budget_App.read_records(statement))
+        self.assertEqual(len(food.ledger), 3, 'Expected withdrawal without funds to be skipped.')
+        self.assertEqual(food.ledger[2], {"amount": -20, "description": ""}, 'Expected imported ledger entry.')
+        self.assertEqual(food.get_balance(), 834.33, 'Expected balance to be 834.33')
+        with self.assertRaises(ValueError):
+            statement.seek(0)
+            Budget_App.Category.from_records("Food", Budget_App.read_records(statement), strict=True)
+
+    def test_write_records(self):
+        self.food.deposit(900, "deposit")
+        self.food.withdraw(45.67, "milk, cereal, eggs, bacon, bread")
+        for fmt in ("csv", "jsonl"):
+            exported = io.StringIO()
+            self.food.write_records(exported, fmt)
+            exported.seek(0)
+            imported = Budget_App.Category.from_records("Food", Budget_App.read_records(exported, fmt))
+            self.assertEqual(imported.ledger, self.food.ledger, f'Expected {fmt} export to import back unchanged.')
+
+    def test_concurrent_transfers(self):
+        self.food.deposit(100, "deposit")
+        self.entertainment.deposit(100, "deposit")
+
+        def shuffle(source, target):
+            for _ in range(500):
+                source.transfer(7, target)
+
+        threads = [threading.Thread(target=shuffle, args=pair) for pair in
+                   [(self.food, self.entertainment), (self.entertainment, self.food)] * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        total = self.food.get_balance() + self.entertainment.get_balance()
+        self.assertEqual(total, 200, 'Expected transfers to conserve the total balance.')
+        self.assertGreaterEqual(min(self.food.get_balance(), self.entertainment.get_balance()), 0, 'Expected no category to be overdrawn.')
+
+    def test_query(self):
+        self.food.deposit(2000, "deposit")
+        self.food.withdraw(900, "Rent for June")
+        self.food.withdraw(45.67, "rent insurance")
+        self.food.withdraw(120, "groceries")
+        actual = self.food.query("rent", max_amount=-100)
+        expected = [{"amount": -900, "description": "Rent for June"}]
+        self.assertEqual(actual, expected, 'Expected only the large rent withdrawal.')
+        self.food.withdraw(300, "rent deposit")
+        actual = self.food.query("RENT deposit")
+        expected = [{"amount": -300, "description": "rent deposit"}]
+        self.assertEqual(actual, expected, 'Expected query to see entries added after the indexes were built.')
+        actual = [item["amount"] for item in self.food.query(min_amount=-200, max_amount=0)]
+        self.assertEqual(actual, [-45.67, -120], 'Expected withdrawals between 0 and 200 in ledger order.')
+        for amount in range(200):
+            self.food.withdraw(amount % 7, "bulk")
+        actual = [item["amount"] for item in self.food.query("bulk", min_amount=-1, max_amount=0)]
+        self.assertEqual(actual, [-(amount % 7) for amount in range(200) if amount % 7 <= 1], 'Expected query to see many entries added after the indexes were built.')
+
+    def test_copy_and_pickle(self):
+        self.food.deposit(900, "deposit")
+        self.food.withdraw(45.67, "milk, cereal, eggs, bacon, bread")
+        for clone in (copy.deepcopy(self.food), pickle.loads(pickle.dumps(self.food))):
+            self.assertEqual(clone.ledger, self.food.ledger, 'Expected copy to have the same ledger.')
+            self.assertEqual(clone.get_balance(), 854.33, 'Expected copy balance to be 854.33')
+            self.assertEqual(clone.transfer(20, self.business), True, 'Expected copy to transfer with its own lock.')
+
     def test_check_funds(self):
         self.food.deposit(10, "deposit")
         actual = self.food.check_funds(20)
@@ -93,6 +242,18 @@ class TestBudgetApp(unittest.TestCase):
         expected = "Percentage spent by category\n100|          \n 90|          \n 80|          \n 70|    o     \n 60|    o     \n 50|    o     \n 40|    o     \n 30|    o     \n 20|    o  o  \n 10|    o  o  \n  0| o  o  o  \n    ----------\n     B  F  E  \n     u  o  n  \n     s  o  t  \n     i  d  e  \n     n     r  \n     e     t  \n     s     a  \n     s     i  \n           n  \n           m  \n           e  \n           n  \n           t  "
         self.assertEqual(actual, expected, 'Expected different chart representation. Check that all spacing is exact.')
 
+    def test_create_spend_chart_after_withdrawal(self):
+        self.food.deposit(900, "deposit")
+        self.business.deposit(900, "deposit")
+        self.food.withdraw(50)
+        self.business.withdraw(50)
+        before = create_spend_chart([self.food, self.business])
+        self.assertEqual(create_spend_chart([self.food, self.business]), before, 'Expected an unchanged chart for unchanged categories.')
+        self.food.withdraw(100)
+        actual = create_spend_chart([self.food, self.business]).splitlines()[4]
+        expected = " 70| o     "
+        self.assertEqual(actual, expected, 'Expected chart to reflect the new withdrawal.')
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,16 @@
 '''Building a Polygon Area Calculator'''
 
+from functools import lru_cache
+import math
+
+try:
+    import numpy as np
+except ImportError: # NumPy is only needed by ShapeCollection and Polygon
+    np = None
+
+# Most parts of the container the exact packing search may work out
+EXACT_PACKING_LIMIT = 10000
+
 class Rectangle:
     """
     Should initialize a 'rectangle' object with
@@ -131,6 +142,28 @@ class Rectangle:
 
             return diagram
 
+    def write_picture(self, writer, max_width=50, max_height=50):
+        """
+        Writing the '*' figure of the object to a writer row by row,
+        scaled down to fit max_width x max_height characters when it is
+        bigger, instead of refusing like get_picture()
+
+        Parameters:
+            self (object):
+                The instance of the Rectangle class
+            writer (object):
+                Text stream, or anything else with a write() method
+            max_width (int):
+                The widest the figure can be, in characters
+            max_height (int):
+                The tallest the figure can be, in lines
+
+        Returns:
+            scale (float):
+                How many units of the shape each character stands for
+        """
+        return write_picture(self, writer, max_width, max_height)
+
     def get_amount_inside(self, shape):
         """
         Calculating the number of times a shape(entered by the user)
@@ -151,6 +184,59 @@ class Rectangle:
         # Returning instance as 0, the shape being fitted is bigger than the main object
         return instance
 
+    def get_amount_packed(self, shape, rotate=True, exact=False):
+        """
+        Calculating the number of copies of a shape that can actually be
+        laid out inside the object without overlapping. By default the
+        object is split into two blocks, each tiled with a grid of the
+        shape, which is quick for any size. The exact search finds the
+        best layout that can be cut out with straight edge to edge cuts,
+        but is only allowed for small objects. Sides must be whole numbers.
+
+        Parameters:
+            self (object):
+                The instance of the Rectangle class
+            shape (object):
+                The instance of the object to be packed in the Rectangle class
+            rotate (bool):
+                Whether the copies can be turned by 90 degrees
+            exact (bool):
+                Whether to search every guillotine layout
+
+        Returns:
+            amount (int):
+                The number of copies that fit
+        """
+        sides = _packing_sides(self, shape)
+        if exact:
+            return _guillotine_count(*sides, rotate)
+
+        return _two_block_packing(*sides, rotate)[0]
+
+    def get_packing(self, shape, rotate=True, exact=False):
+        """
+        Laying out as many copies of a shape as get_amount_packed() counts
+
+        Parameters:
+            self (object):
+                The instance of the Rectangle class
+            shape (object):
+                The instance of the object to be packed in the Rectangle class
+            rotate (bool):
+                Whether the copies can be turned by 90 degrees
+            exact (bool):
+                Whether to search every guillotine layout
+
+        Returns:
+            placements (list):
+                (x, y, width, height) of every copy, from the top left corner
+        """
+        sides = _packing_sides(self, shape)
+        if exact:
+            return _guillotine_placements(*sides, rotate)
+
+        return _two_block_placements(*sides, rotate)
+
     def __str__(self):
         """
         Providing a string representation of the rectangle
@@ -247,6 +333,1060 @@ class Square(Rectangle):
         return square_object
 
 
+def _packing_sides(container, shape):
+    """
+    Checks the sides of a container and of the shape packed in it are
+    whole numbers, which the packing layouts are worked out in
+
+    Parameters:
+        container (object):
+            The Rectangle to pack copies of the shape in
+        shape (object):
+            The Rectangle to pack
+
+    Returns:
+        sides (tuple):
+            The container's width and height and the shape's, as ints
+    """
+    sides = (container.width, container.height, shape.width, shape.height)
+    if any(side != int(side) or side < 0 for side in sides):
+        raise ValueError(f"Packing needs whole number sides, got {sides}")
+    if shape.width == 0 or shape.height == 0:
+        raise ValueError("Packing needs a shape with non zero sides")
+
+    return tuple(int(side) for side in sides)
+
+
+def _best_split(width, height, orientations):
+    """
+    Finds the best way of cutting a container into a left and a right
+    block, each tiled with a grid of the piece in one orientation
+
+    Moving one more grid column of the piece from the right block to the
+    left one always changes the amount by the same step once the right
+    block loses a whole number of its columns, so the best cut is always
+    within that many columns of either end, and only those are tried.
+
+    Parameters:
+        width, height (int):
+            The dimensions of the container
+        orientations (set):
+            (width, height) of every orientation the piece can take
+
+    Returns:
+        split (tuple):
+            (amount, left orientation, left columns, right orientation)
+    """
+    best = (0, None, 0, None)
+    for left in orientations:
+        left_width, left_height = left
+        if left_width > width or left_height > height:
+            continue
+        left_rows = height // left_height
+        most_columns = width // left_width
+        for right in orientations:
+            right_width, right_height = right
+            right_rows = height // right_height
+            period = right_width // math.gcd(left_width, right_width)
+            columns = set(range(min(period, most_columns + 1)))
+            columns.update(range(max(0, most_columns + 1 - period), most_columns + 1))
+            for left_columns in columns:
+                right_columns = (width - left_columns * left_width) // right_width
+                amount = left_columns * left_rows + right_columns * right_rows
+                if amount > best[0]:
+                    best = (amount, left, left_columns, right)
+
+    return best
+
+
+@lru_cache(maxsize=4096)
+def _two_block_packing(width, height, piece_width, piece_height, rotate):
+    """
+    Packs a container by cutting it straight across once, either top to
+    bottom or side to side, and tiling each of the two blocks with a
+    grid of the piece. This takes time in proportion to the piece size,
+    however big the container is. Cached on the container and the piece.
+
+    Parameters:
+        width, height (int):
+            The dimensions of the container
+        piece_width, piece_height (int):
+            The dimensions of the piece
+        rotate (bool):
+            Whether the piece can be turned by 90 degrees
+
+    Returns:
+        amount (int):
+            The number of copies that fit
+        split (tuple):
+            Whether the cut runs top to bottom, and the _best_split() of it
+    """
+    orientations = {(piece_width, piece_height)}
+    if rotate:
+        orientations.add((piece_height, piece_width))
+
+    vertical = _best_split(width, height, orientations)
+    # A side to side cut is a top to bottom one of the container turned over
+    horizontal = _best_split(height, width, {(down, across) for across, down in orientations})
+    if horizontal[0] > vertical[0]:
+        return horizontal[0], (False, horizontal)
+
+    return vertical[0], (True, vertical)
+
+
+def _grid_placements(x, y, columns, rows, piece_width, piece_height):
+    """
+    Lays out a grid of copies of a piece from a top left corner
+
+    Parameters:
+        x, y (int):
+            Position of the grid's top left corner
+        columns, rows (int):
+            The number of copies across and down
+        piece_width, piece_height (int):
+            The dimensions of the piece
+
+    Returns:
+        placements (list):
+            (x, y, width, height) of every copy
+    """
+    return [(x + column * piece_width, y + row * piece_height, piece_width, piece_height)
+            for row in range(rows) for column in range(columns)]
+
+
+def _two_block_placements(width, height, piece_width, piece_height, rotate):
+    """
+    Lays out the copies counted by _two_block_packing()
+
+    Parameters:
+        width, height (int):
+            The dimensions of the container
+        piece_width, piece_height (int):
+            The dimensions of the piece
+        rotate (bool):
+            Whether the piece can be turned by 90 degrees
+
+    Returns:
+        placements (list):
+            (x, y, width, height) of every copy
+    """
+    amount, (top_to_bottom, split) = _two_block_packing(width, height, piece_width,
+                                                        piece_height, rotate)
+    if amount == 0:
+        return []
+    if not top_to_bottom:
+        width, height = height, width
+    _, (left_width, left_height), left_columns, (right_width, right_height) = split
+
+    cut = left_columns * left_width
+    blocks = [(0, left_columns, left_width, left_height),
+              (cut, (width - cut) // right_width, right_width, right_height)]
+    placements = []
+    for x, columns, across, down in blocks:
+        placements += _grid_placements(x, 0, columns, height // down, across, down)
+    if not top_to_bottom:
+        # Turning the layout of the turned over container back
+        placements = [(y, x, down, across) for x, y, across, down in placements]
+
+    return placements
+
+
+def _normal_lengths(length, sizes):
+    """
+    Lists the lengths up to a limit that can be made by lining up pieces
+    of the given sizes. A guillotine packing only ever needs to cut at
+    these positions, and the rest of any other length is wasted anyway
+
+    Parameters:
+        length (int):
+            The longest length to consider
+        sizes (tuple):
+            The sizes of the piece along this side
+
+    Returns:
+        lengths (list):
+            The reachable lengths in increasing order, starting at 0
+        floor (list):
+            For every length up to the limit, the longest reachable one
+            that is not longer
+    """
+    reachable = [False] * (length + 1)
+    reachable[0] = True
+    for size in range(1, length + 1):
+        reachable[size] = any(size >= piece and reachable[size - piece] for piece in sizes)
+
+    lengths = []
+    floor = []
+    for size in range(length + 1):
+        if reachable[size]:
+            lengths.append(size)
+        floor.append(lengths[-1])
+
+    return lengths, floor
+
+
+@lru_cache(maxsize=16)
+def _guillotine_table(width, height, piece_width, piece_height, rotate):
+    """
+    Works out the best guillotine packing of every part of a container
+    that a cut can produce: each part is either filled with a grid of
+    the piece, or cut straight across into two parts packed on their own.
+    Only cuts at the lengths from _normal_lengths() are tried, which is
+    enough to find the best packing among all the guillotine ones.
+    The work grows with the cube of the container size, so containers
+    with more than EXACT_PACKING_LIMIT parts are refused. Cached, so a
+    (container, piece) pair is only ever worked out once.
+
+    Parameters:
+        width, height (int):
+            The dimensions of the container
+        piece_width, piece_height (int):
+            The dimensions of the piece
+        rotate (bool):
+            Whether the piece can be turned by 90 degrees
+
+    Returns:
+        table (dict):
+            (amount, how) for every (width, height) part, where how is
+            ("grid", piece width, piece height), ("x", cut) or ("y", cut)
+        floor_x, floor_y (list):
+            The floor lists of the container's width and height
+    """
+    orientations = {(piece_width, piece_height)}
+    if rotate:
+        orientations.add((piece_height, piece_width))
+    xs, floor_x = _normal_lengths(width, {across for across, _ in orientations})
+    ys, floor_y = _normal_lengths(height, {down for _, down in orientations})
+    if len(xs) * len(ys) > EXACT_PACKING_LIMIT:
+        raise ValueError(f"A {width}x{height} container is too big for the exact packing")
+    piece_area = piece_width * piece_height
+
+    table = {}
+    for part_width in xs:
+        for part_height in ys:
+            best, how = 0, None
+            # Filling the whole part with a grid of the piece
+            for across_width, down_height in orientations:
+                if across_width <= part_width and down_height <= part_height:
+                    amount = (part_width // across_width) * (part_height // down_height)
+                    if amount > best:
+                        best, how = amount, ("grid", across_width, down_height)
+            # No cut can do better than using up the whole area
+            bound = part_width * part_height // piece_area
+            # Cutting the part into a left and a right one
+            for cut in xs[1:]:
+                if best == bound or cut * 2 > part_width:
+                    break
+                amount = (table[cut, part_height][0]
+                          + table[floor_x[part_width - cut], part_height][0])
+                if amount > best:
+                    best, how = amount, ("x", cut)
+            # Cutting the part into a top and a bottom one
+            for cut in ys[1:]:
+                if best == bound or cut * 2 > part_height:
+                    break
+                amount = (table[part_width, cut][0]
+                          + table[part_width, floor_y[part_height - cut]][0])
+                if amount > best:
+                    best, how = amount, ("y", cut)
+            table[part_width, part_height] = (best, how)
+
+    return table, floor_x, floor_y
+
+
+def _guillotine_count(width, height, piece_width, piece_height, rotate):
+    """
+    Counts the copies of a piece the best guillotine packing of a
+    container holds, that is the best packing that can be cut out with
+    straight cuts running from one side of a part to the other
+
+    Parameters:
+        width, height (int):
+            The dimensions of the container
+        piece_width, piece_height (int):
+            The dimensions of the piece
+        rotate (bool):
+            Whether the piece can be turned by 90 degrees
+
+    Returns:
+        amount (int):
+            The number of copies that fit
+    """
+    table, floor_x, floor_y = _guillotine_table(width, height, piece_width, piece_height, rotate)
+
+    return table[floor_x[width], floor_y[height]][0]
+
+
+def _guillotine_placements(width, height, piece_width, piece_height, rotate):
+    """
+    Lays out the copies counted by _guillotine_count(), following the
+    cuts it found to be best
+
+    Parameters:
+        width, height (int):
+            The dimensions of the container
+        piece_width, piece_height (int):
+            The dimensions of the piece
+        rotate (bool):
+            Whether the piece can be turned by 90 degrees
+
+    Returns:
+        placements (list):
+            (x, y, width, height) of every copy
+    """
+    table, floor_x, floor_y = _guillotine_table(width, height, piece_width, piece_height, rotate)
+
+    placements = []
+    # Parts still to be laid out, as (x, y, width, height)
+    parts = [(0, 0, floor_x[width], floor_y[height])]
+    while parts:
+        x, y, part_width, part_height = parts.pop()
+        how = table[part_width, part_height][1]
+        if how is None:
+            continue
+        if how[0] == "grid":
+            _, across_width, down_height = how
+            placements += [(x + column * across_width, y + row * down_height,
+                            across_width, down_height)
+                           for row in range(part_height // down_height)
+                           for column in range(part_width // across_width)]
+        elif how[0] == "x":
+            cut = how[1]
+            parts.append((x + cut, y, floor_x[part_width - cut], part_height))
+            parts.append((x, y, cut, part_height))
+        else:
+            cut = how[1]
+            parts.append((x, y + cut, part_width, floor_y[part_height - cut]))
+            parts.append((x, y, part_width, cut))
+
+    return placements
+
+
+@lru_cache(maxsize=1024)
+def _shelf_pack(width, height, pieces):
+    """
+    Packs pieces of mixed sizes into a container on shelves: the tallest
+    pieces go first, each on the first shelf with room for it, and a new
+    shelf is opened below when none has. Cached on the container and
+    piece dimensions.
+
+    Parameters:
+        width, height (int):
+            The dimensions of the container
+        pieces (tuple):
+            (width, height) of every piece
+
+    Returns:
+        placements (tuple):
+            (index, x, y, width, height, rotated) of every placed piece
+        unplaced (tuple):
+            Indexes of the pieces that didn't fit
+    """
+    # Laying each piece on its long side when that fits the container width
+    oriented = []
+    for index, (piece_width, piece_height) in enumerate(pieces):
+        rotated = piece_height > piece_width and piece_height <= width
+        # Turning a piece that only fits the container the other way round
+        if (not rotated and (piece_width > width or piece_height > height)
+                and piece_height <= width and piece_width <= height):
+            rotated = True
+        if rotated:
+            piece_width, piece_height = piece_height, piece_width
+        oriented.append((index, piece_width, piece_height, rotated))
+    oriented.sort(key=lambda piece: piece[2], reverse=True)
+
+    shelves = [] # [y, shelf height, used width]
+    next_shelf_y = 0
+    placements = []
+    unplaced = []
+    for index, piece_width, piece_height, rotated in oriented:
+        for shelf in shelves:
+            if piece_height <= shelf[1] and shelf[2] + piece_width <= width:
+                placements.append((index, shelf[2], shelf[0], piece_width, piece_height, rotated))
+                shelf[2] += piece_width
+                break
+        else:
+            if piece_width <= width and next_shelf_y + piece_height <= height:
+                shelves.append([next_shelf_y, piece_height, piece_width])
+                placements.append((index, 0, next_shelf_y, piece_width, piece_height, rotated))
+                next_shelf_y += piece_height
+            else:
+                unplaced.append(index)
+
+    placements.sort()
+    return tuple(placements), tuple(sorted(unplaced))
+
+
+def pack_shapes(container, shapes):
+    """
+    Packs a list of shapes of mixed sizes into a container shape
+
+    Parameters:
+        container (object):
+            The Rectangle (or Square) to pack the shapes in
+        shapes (list):
+            The Rectangle and Square objects to pack
+
+    Returns:
+        placements (list):
+            (index, x, y, width, height, rotated) of every placed shape,
+            index being the shape's position in shapes
+        unplaced (list):
+            Indexes of the shapes that didn't fit
+    """
+    pieces = tuple((shape.width, shape.height) for shape in shapes)
+    placements, unplaced = _shelf_pack(container.width, container.height, pieces)
+
+    return list(placements), list(unplaced)
+
+
+def _picture_scale(width, height, max_width, max_height):
+    """
+    Finds how many units each character has to stand for, so that a
+    figure of width x height fits max_width x max_height characters
+
+    Parameters:
+        width, height (int):
+            The dimensions of the figure
+        max_width, max_height (int):
+            The largest the picture can be, in characters and lines
+
+    Returns:
+        scale (float):
+            Units per character, 1 when the figure already fits
+    """
+    return max(1, width / max_width, height / max_height)
+
+
+def write_picture(shape, writer, max_width=50, max_height=50):
+    """
+    Writing the '*' figure of a shape to a writer one row at a time,
+    scaled down when it is bigger than max_width x max_height. Only one
+    row is ever held in memory, however big the shape is. Shapes that
+    fit are written exactly as get_picture() draws them.
+
+    Parameters:
+        shape (object):
+            The instance of the Rectangle class to draw
+        writer (object):
+            Text stream, or anything else with a write() method
+        max_width (int):
+            The widest the figure can be, in characters
+        max_height (int):
+            The tallest the figure can be, in lines
+
+    Returns:
+        scale (float):
+            How many units of the shape each character stands for
+    """
+    scale = _picture_scale(shape.width, shape.height, max_width, max_height)
+    # Keeping at least one character for any non empty side
+    columns = max(1, round(shape.width / scale)) if shape.width else 0
+    rows = max(1, round(shape.height / scale)) if shape.height else 0
+
+    row = ("*" * columns) + "\n"
+    for _ in range(rows):
+        writer.write(row)
+
+    return scale
+
+
+def _canvas_character(character):
+    """
+    Checks a character can fill exactly one cell of a Canvas
+
+    Parameters:
+        character (str):
+            The character to check
+
+    Returns:
+        (bytes):
+            The character encoded as a single ASCII byte
+    """
+    if not isinstance(character, str) or len(character) != 1 or not character.isascii():
+        raise ValueError(f"A canvas character must be exactly one ASCII character, got {character!r}")
+
+    return character.encode("ascii")
+
+
+class Canvas:
+    """
+    A character canvas many shapes can be drawn onto at their positions,
+    e.g. a floor plan or the placements of a packing. The area is scaled
+    down to fit max_width x max_height characters, and the characters
+    are held in one bytearray, so memory stays bounded however large
+    the area is.
+
+    It contains:
+        draw: fills a shape's rectangle at a position
+        draw_placements: draws (x, y, width, height) placements
+        write: streams the rows to a writer
+        get_picture: returns the canvas as a string
+    """
+
+    def __init__(self, width, height, max_width=80, max_height=40, background=" "):
+        """
+        Creating a Canvas class with a constructor that takes in
+        the size of the area to draw
+
+        Parameters:
+            self (object):
+                The instance of the Canvas class
+            width, height (int):
+                The dimensions of the area to draw
+            max_width, max_height (int):
+                The largest the canvas can be, in characters and lines
+            background (str):
+                The character of empty space
+        """
+        self.scale = _picture_scale(width, height, max_width, max_height)
+        self.columns = max(1, math.ceil(width / self.scale))
+        self.rows = max(1, math.ceil(height / self.scale))
+        self.buffer = bytearray(_canvas_character(background) * (self.columns * self.rows))
+
+    def _cells(self, start, length, limit):
+        """
+        Maps a span of the area onto the range of cells it covers
+
+        Parameters:
+            self (object):
+                The instance of the Canvas class
+            start, length (float):
+                Where the span starts and how long it is
+            limit (int):
+                The number of cells on that axis
+
+        Returns:
+            (tuple):
+                The first cell and the cell after the last, clipped to the canvas
+        """
+        first = max(0, math.floor(start / self.scale))
+        last = min(limit, math.ceil((start + length) / self.scale))
+
+        return first, last
+
+    def draw(self, shape, x=0, y=0, fill="*"):
+        """
+        Filling the rectangle of a shape with its top left corner at (x, y)
+
+        Parameters:
+            self (object):
+                The instance of the Canvas class
+            shape (object):
+                The instance of the Rectangle class to draw
+            x, y (float):
+                The position of the shape's top left corner
+            fill (str):
+                The character to draw the shape with
+        """
+        character = _canvas_character(fill)
+        first_column, last_column = self._cells(x, shape.width, self.columns)
+        first_row, last_row = self._cells(y, shape.height, self.rows)
+        if first_column >= last_column:
+            return
+        span = character * (last_column - first_column)
+        for row in range(first_row, last_row):
+            start = row * self.columns + first_column
+            self.buffer[start:start + len(span)] = span
+
+    def draw_placements(self, placements, fill="*"):
+        """
+        Drawing the (x, y, width, height) placements from get_packing()
+
+        Parameters:
+            self (object):
+                The instance of the Canvas class
+            placements (list):
+                (x, y, width, height) of every shape to draw
+            fill (str):
+                The character to draw the shapes with
+        """
+        for x, y, width, height in placements:
+            self.draw(Rectangle(width, height), x, y, fill)
+
+    def write(self, writer):
+        """
+        Writing the canvas to a writer one row at a time
+
+        Parameters:
+            self (object):
+                The instance of the Canvas class
+            writer (object):
+                Text stream, or anything else with a write() method
+        """
+        view = memoryview(self.buffer)
+        for row in range(self.rows):
+            start = row * self.columns
+            writer.write(view[start:start + self.columns].tobytes().decode("ascii") + "\n")
+
+    def get_picture(self):
+        """
+        Returning the canvas as a string
+
+        Parameters:
+            self (object):
+                The instance of the Canvas class
+        """
+        return "".join(self.buffer[row * self.columns:(row + 1) * self.columns].decode("ascii") + "\n"
+                       for row in range(self.rows))
+
+
+class CompactRectangle:
+    """
+    A memory-lean Rectangle: the same interface, but its attributes are
+    held in __slots__ instead of a per-instance __dict__, and the area,
+    perimeter and diagonal are cached until the dimensions change.
+    """
+    __slots__ = ('_width', '_height', '_area', '_perimeter', '_diagonal')
+
+    def __init__(self, width, height):
+        """
+        Creating a CompactRectangle class with a constructor
+        that takes in width and height
+
+        Parameters:
+            self (object):
+                The instance of the CompactRectangle class
+            width (int):
+                The width of the rectangle
+            height (int):
+                The height of the rectangle
+        """
+        self._width = width
+        self._height = height
+        self._clear_cache()
+
+    def _clear_cache(self):
+        """
+        Forgetting the cached metrics after the dimensions change
+
+        Parameters:
+            self (object):
+                The instance of the CompactRectangle class
+        """
+        self._area = None
+        self._perimeter = None
+        self._diagonal = None
+
+    @property
+    def width(self):
+        return self._width
+
+    @width.setter
+    def width(self, width):
+        self._width = width
+        self._clear_cache()
+
+    @property
+    def height(self):
+        return self._height
+
+    @height.setter
+    def height(self, height):
+        self._height = height
+        self._clear_cache()
+
+    def set_width(self, width):
+        """
+        Sets the width of the rectangle
+
+        Parameters:
+            self (object):
+                The instance of the CompactRectangle class
+            width (int):
+                The new width of the rectangle
+        """
+        self.width = width
+
+    def set_height(self, height):
+        """
+        Sets the height of the rectangle
+
+        Parameters:
+            self (object):
+                The instance of the CompactRectangle class
+            height (int):
+                The new height of the rectangle
+        """
+        self.height = height
+
+    def get_area(self):
+        """
+        Returns the area of the rectangle, calculating it only once
+
+        Parameters:
+            self (object):
+                The instance of the CompactRectangle class
+        """
+        if self._area is None:
+            self._area = Rectangle.get_area(self)
+        return self._area
+
+    def get_perimeter(self):
+        """
+        Returns the perimeter of the rectangle, calculating it only once
+
+        Parameters:
+            self (object):
+                The instance of the CompactRectangle class
+        """
+        if self._perimeter is None:
+            self._perimeter = Rectangle.get_perimeter(self)
+        return self._perimeter
+
+    def get_diagonal(self):
+        """
+        Returns the length of the diagonal of the rectangle,
+        calculating it only once
+
+        Parameters:
+            self (object):
+                The instance of the CompactRectangle class
+        """
+        if self._diagonal is None:
+            self._diagonal = Rectangle.get_diagonal(self)
+        return self._diagonal
+
+    # Sharing the methods that don't depend on how the attributes are stored
+    get_picture = Rectangle.get_picture
+    get_amount_inside = Rectangle.get_amount_inside
+    get_amount_packed = Rectangle.get_amount_packed
+    get_packing = Rectangle.get_packing
+    write_picture = Rectangle.write_picture
+    __str__ = Rectangle.__str__
+
+
+class CompactSquare(CompactRectangle):
+    """
+    A memory-lean Square, with the same caching as CompactRectangle
+    """
+    __slots__ = ()
+
+    def __init__(self, side):
+        """
+        Creating a CompactSquare class with a constructor
+        that takes in the side of the square
+
+        Parameters:
+            self (object):
+                The instance of the CompactSquare class
+            side (float):
+                The length of the side of the square
+        """
+        super().__init__(side, side)
+
+    def set_side(self, side):
+        """
+        Setting both the width and height of the square to the side
+
+        Parameters:
+            self (object):
+                The instance of the CompactSquare class
+            side (float):
+                The length of the side of the square
+        """
+        self._width = side
+        self._height = side
+        self._clear_cache()
+
+    set_width = set_side
+    set_height = set_side
+    __str__ = Square.__str__
+
+
+class ShapeCollection:
+    """
+    Holds many rectangles and squares as columns of widths and heights,
+    so their metrics can be calculated for every shape in one pass.
+
+    It contains:
+        from_shapes: builds a collection from Rectangle and Square objects
+        to_shapes: turns the collection back into Rectangle and Square objects
+        get_areas, get_perimeters, get_diagonals: arrays of each metric
+        get_amounts_inside: get_amount_inside of a shape for every shape
+    """
+
+    def __init__(self, widths, heights, is_square=None):
+        """
+        Creating a collection from its columns
+
+        Parameters:
+            self (object):
+                The instance of the ShapeCollection class
+            widths (array-like):
+                The widths of the shapes
+            heights (array-like):
+                The heights of the shapes
+            is_square (array-like, optional):
+                Which shapes are squares, defaults to none of them
+        """
+        if np is None:
+            raise ImportError("NumPy is required for ShapeCollection")
+        self.widths = np.asarray(widths)
+        self.heights = np.asarray(heights)
+        if self.widths.shape != self.heights.shape:
+            raise ValueError("widths and heights must have the same length")
+        if is_square is None:
+            is_square = np.zeros(len(self.widths), dtype=bool)
+        self.is_square = np.asarray(is_square, dtype=bool)
+
+    @classmethod
+    def from_shapes(cls, shapes):
+        """
+        Building a collection from Rectangle and Square objects
+
+        Parameters:
+            shapes (list):
+                The Rectangle and Square objects
+        
+        Returns:
+            collection (object):
+                The shapes' widths and heights as a ShapeCollection
+        """
+        shapes = list(shapes)
+        widths = [shape.width for shape in shapes]
+        heights = [shape.height for shape in shapes]
+        is_square = [isinstance(shape, (Square, CompactSquare)) for shape in shapes]
+
+        return cls(widths, heights, is_square)
+
+    def to_shapes(self, compact=False):
+        """
+        Turning the collection back into Rectangle and Square objects
+
+        Parameters:
+            compact (bool):
+                Whether to make CompactRectangle and CompactSquare objects
+
+        Returns:
+            shapes (list):
+                A Rectangle or Square for every shape in the collection
+        """
+        rectangle, square_class = ((CompactRectangle, CompactSquare) if compact
+                                   else (Rectangle, Square))
+        return [square_class(width) if square else rectangle(width, height)
+                for width, height, square in zip(self.widths.tolist(), self.heights.tolist(),
+                                                 self.is_square.tolist())]
+
+    def __len__(self):
+        return len(self.widths)
+
+    def get_areas(self):
+        """
+        Calculates the area of every shape
+
+        Returns:
+            areas (ndarray):
+                The areas (width * height) of the shapes
+        """
+        return self.widths * self.heights
+
+    def get_perimeters(self):
+        """
+        Calculates the perimeter of every shape
+
+        Returns:
+            perimeters (ndarray):
+                The perimeters (2 * width + 2 * height) of the shapes
+        """
+        return 2 * self.widths + 2 * self.heights
+
+    def get_diagonals(self):
+        """
+        Calculates the length of the diagonal of every shape,
+        rounded to 3 decimal places like get_diagonal()
+
+        Returns:
+            diagonals (ndarray):
+                The diagonal lengths of the shapes
+        """
+        return np.round(np.hypot(self.widths, self.heights), 3)
+
+    def get_amounts_inside(self, shape):
+        """
+        Calculates how many times a shape fits inside every shape in the
+        collection, with the same rule as get_amount_inside()
+
+        Parameters:
+            shape (object):
+                The instance of the object to be fitted in the shapes
+
+        Returns:
+            amounts (ndarray):
+                The number of times the shape fits in each shape
+        """
+        amounts = self.get_areas() // shape.get_area()
+        # Same size check as get_amount_inside(), against the height of each shape
+        fits = (shape.width < self.heights) & (shape.height < self.heights)
+
+        return np.where(fits, amounts, 0)
+
+
+class Polygon:
+    """
+    Should initialize a 'polygon' object from its vertices in order
+    around the boundary. Needs to be represented by 'Polygon(sides=4)'
+
+    It should also contain, like Rectangle:
+        get_area: returns the area (shoelace formula)
+        get_perimeter: returns the sum of the edge lengths
+        from_rectangle: builds the polygon of a Rectangle or Square
+    """
+
+    def __init__(self, vertices):
+        """
+        Creating a Polygon class with a constructor that stores
+        its vertices in a contiguous (n, 2) array
+
+        Parameters:
+            self (object):
+                The instance of the Polygon class
+            vertices (array-like):
+                The (x, y) coordinates of at least 3 vertices
+        """
+        if np is None:
+            raise ImportError("NumPy is required for Polygon")
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float64).reshape(-1, 2)
+        if len(self.vertices) < 3:
+            raise ValueError("A polygon needs at least 3 vertices")
+
+    @classmethod
+    def from_rectangle(cls, rectangle):
+        """
+        Building the polygon of a Rectangle or Square, with its
+        bottom left corner at the origin
+
+        Parameters:
+            rectangle (object):
+                The instance of the Rectangle class
+
+        Returns:
+            polygon (object):
+                The rectangle as a Polygon
+        """
+        width, height = rectangle.width, rectangle.height
+        return cls([(0, 0), (width, 0), (width, height), (0, height)])
+
+    def get_area(self):
+        """
+        Calculates the area of the polygon with the shoelace formula
+
+        Parameters:
+            self (object):
+                The instance of the Polygon class
+
+        Returns:
+            area (float):
+                The area of the polygon
+        """
+        x, y = self.vertices[:, 0], self.vertices[:, 1]
+        # Summing the cross products of every vertex with the next one
+        area = abs(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2
+
+        return float(area)
+
+    def get_perimeter(self):
+        """
+        Calculates the perimeter, or boundary length, of the polygon
+
+        Parameters:
+            self (object):
+                The instance of the Polygon class
+
+        Returns:
+            perimeter (float):
+                The sum of the lengths of the edges
+        """
+        edges = np.roll(self.vertices, -1, axis=0) - self.vertices
+        perimeter = np.hypot(edges[:, 0], edges[:, 1]).sum()
+
+        return float(perimeter)
+
+    def __str__(self):
+        """
+        Providing a string representation of the polygon
+
+        Parameters:
+            self (object):
+                The instance of the Polygon class
+        """
+        polygon_object = f"Polygon(sides={len(self.vertices)})"
+
+        return polygon_object
+
+
+def _next_vertices(offsets, count):
+    """
+    Finds the index of the next vertex of every vertex in a ragged batch
+    of polygons, wrapping the last vertex of each polygon to its first
+
+    Parameters:
+        offsets (ndarray):
+            Where each polygon's vertices start, plus the total at the end
+        count (int):
+            The total number of vertices
+
+    Returns:
+        next_indexes (ndarray):
+            The index of the vertex after each vertex
+    """
+    if np.any(np.diff(offsets) < 3):
+        raise ValueError("Every polygon needs at least 3 vertices")
+    if offsets[0] != 0 or offsets[-1] != count:
+        raise ValueError("offsets must start at 0 and end at the number of vertices")
+    next_indexes = np.arange(1, count + 1)
+    next_indexes[offsets[1:] - 1] = offsets[:-1]
+
+    return next_indexes
+
+
+def polygon_areas(vertices, offsets):
+    """
+    Calculates the areas of many polygons stored back to back in one
+    array, with the shoelace formula for all of them in one pass
+
+    Parameters:
+        vertices (array-like):
+            The (x, y) coordinates of the vertices of every polygon
+        offsets (array-like):
+            Where each polygon's vertices start, plus the total at the end,
+            so polygon i has vertices[offsets[i]:offsets[i + 1]]
+
+    Returns:
+        areas (ndarray):
+            The area of every polygon
+    """
+    vertices = np.ascontiguousarray(vertices, dtype=np.float64).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    next_indexes = _next_vertices(offsets, len(vertices))
+    x, y = vertices[:, 0], vertices[:, 1]
+    cross = x * y[next_indexes] - x[next_indexes] * y
+
+    return np.abs(np.add.reduceat(cross, offsets[:-1])) / 2
+
+
+def polygon_perimeters(vertices, offsets):
+    """
+    Calculates the perimeters of many polygons stored back to back in
+    one array, in one pass
+
+    Parameters:
+        vertices (array-like):
+            The (x, y) coordinates of the vertices of every polygon
+        offsets (array-like):
+            Where each polygon's vertices start, plus the total at the end
+
+    Returns:
+        perimeters (ndarray):
+            The perimeter of every polygon
+    """
+    vertices = np.ascontiguousarray(vertices, dtype=np.float64).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    edges = vertices[_next_vertices(offsets, len(vertices))] - vertices
+
+    return np.add.reduceat(np.hypot(edges[:, 0], edges[:, 1]), offsets[:-1])
+
+
 if __name__ == "__main__":
     rect = Rectangle(15, 10)
     print(rect)
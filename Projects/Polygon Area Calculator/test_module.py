@@ -0,0 +1,158 @@
+import io
+import unittest
+from itertools import combinations
+import polygon_area_calculator
+from polygon_area_calculator import (Rectangle, Square, CompactRectangle, CompactSquare,
+                                     ShapeCollection, Polygon, polygon_areas,
+                                     polygon_perimeters, write_picture, pack_shapes, Canvas)
+
+class UnitTests(unittest.TestCase):
+
+    @unittest.skipIf(polygon_area_calculator.np is None, 'NumPy is not installed')
+    def test_shape_collection(self):
+        shapes = [Rectangle(3, 6), Square(5), Rectangle(10, 1), Square(2), Rectangle(50, 7)]
+        collection = ShapeCollection.from_shapes(shapes)
+        self.assertEqual(len(collection), len(shapes))
+        self.assertEqual(collection.get_areas().tolist(), [shape.get_area() for shape in shapes])
+        self.assertEqual(collection.get_perimeters().tolist(),
+                         [shape.get_perimeter() for shape in shapes])
+        self.assertEqual(collection.get_diagonals().tolist(),
+                         [shape.get_diagonal() for shape in shapes])
+        self.assertEqual(collection.get_amounts_inside(Square(2)).tolist(),
+                         [shape.get_amount_inside(Square(2)) for shape in shapes])
+        self.assertEqual([str(shape) for shape in collection.to_shapes()],
+                         [str(shape) for shape in shapes])
+
+    def test_compact_rectangle(self):
+        rect = CompactRectangle(3, 6)
+        self.assertEqual(rect.get_area(), 18)
+        self.assertEqual(rect.get_diagonal(), Rectangle(3, 6).get_diagonal())
+        rect.set_width(4)
+        self.assertEqual(rect.get_area(), 24)
+        self.assertEqual(rect.get_perimeter(), 20)
+        rect.height = 3
+        self.assertEqual(rect.get_area(), 12)
+        self.assertEqual(rect.get_diagonal(), 5)
+        self.assertEqual(str(rect), 'Rectangle(width=4, height=3)')
+
+    def test_compact_square(self):
+        sq = CompactSquare(2)
+        self.assertEqual(sq.get_area(), 4)
+        sq.set_side(5)
+        self.assertEqual(sq.get_area(), 25)
+        sq.set_width(3)
+        self.assertEqual(sq.get_perimeter(), 12)
+        self.assertEqual(str(sq), 'Square(side=3)')
+
+    def test_get_amount_packed(self):
+        self.assertEqual(Rectangle(10, 10).get_amount_packed(Rectangle(3, 4)), 7)
+        self.assertEqual(Rectangle(15, 10).get_amount_packed(Rectangle(3, 4), rotate=False), 10)
+        self.assertEqual(Rectangle(4, 8).get_amount_packed(Rectangle(5, 1)), 4)
+        self.assertEqual(Rectangle(2, 2).get_amount_packed(Square(3)), 0)
+        self.assertEqual(Rectangle(1000, 1000).get_amount_packed(Rectangle(3, 2)), 166666)
+
+    def test_get_amount_packed_exact(self):
+        self.assertEqual(Rectangle(7, 8).get_amount_packed(Rectangle(2, 3)), 8)
+        self.assertEqual(Rectangle(7, 8).get_amount_packed(Rectangle(2, 3), exact=True), 9)
+        with self.assertRaises(ValueError):
+            Rectangle(500, 500).get_amount_packed(Rectangle(3, 2), exact=True)
+        with self.assertRaises(ValueError):
+            Rectangle(2.5, 3).get_amount_packed(Square(1))
+        self.assertEqual(Rectangle(3.0, 3).get_amount_packed(Square(1)), 9)
+
+    def test_get_packing(self):
+        for container, shape, exact in [(Rectangle(10, 10), Rectangle(3, 4), False),
+                                        (Rectangle(23, 17), Rectangle(5, 3), False),
+                                        (Rectangle(16, 9), Square(4), False),
+                                        (Rectangle(7, 8), Rectangle(2, 3), True),
+                                        (Rectangle(23, 17), Rectangle(5, 3), True)]:
+            placements = container.get_packing(shape, exact=exact)
+            self.assertEqual(len(placements), container.get_amount_packed(shape, exact=exact))
+            for x, y, width, height in placements:
+                self.assertEqual(sorted((width, height)), sorted((shape.width, shape.height)))
+                self.assertTrue(0 <= x and x + width <= container.width)
+                self.assertTrue(0 <= y and y + height <= container.height)
+            for first, second in combinations(placements, 2):
+                self.assertTrue(first[0] + first[2] <= second[0] or second[0] + second[2] <= first[0]
+                                or first[1] + first[3] <= second[1] or second[1] + second[3] <= first[1],
+                                f'{first} overlaps {second}')
+
+    def test_pack_shapes(self):
+        shapes = [Rectangle(4, 2), Square(3), Rectangle(1, 5), Rectangle(10, 3), Square(9)]
+        placements, unplaced = pack_shapes(Rectangle(8, 12), shapes)
+        self.assertEqual(unplaced, [2, 4])
+        self.assertEqual([placement[0] for placement in placements], [0, 1, 3])
+        self.assertTrue(placements[2][5], 'Expected the 10x3 rectangle to be turned to fit.')
+        for index, x, y, width, height, rotated in placements:
+            shape = shapes[index]
+            self.assertEqual((width, height), (shape.height, shape.width) if rotated else (shape.width, shape.height))
+            self.assertTrue(0 <= x and x + width <= 8 and 0 <= y and y + height <= 12)
+        for first, second in combinations(placements, 2):
+            self.assertTrue(first[1] + first[3] <= second[1] or second[1] + second[3] <= first[1]
+                            or first[2] + first[4] <= second[2] or second[2] + second[4] <= first[2],
+                            f'{first} overlaps {second}')
+        self.assertEqual(pack_shapes(Rectangle(5, 20), [Rectangle(10, 3)]), ([(0, 0, 0, 3, 10, True)], []))
+
+    @unittest.skipIf(polygon_area_calculator.np is None, 'NumPy is not installed')
+    def test_polygon_batches(self):
+        polygons = [[(0, 0), (4, 0), (4, 3)],
+                    [(0, 0), (2, 0), (2, 2), (0, 2)],
+                    [(1, 1), (5, 1), (6, 4), (3, 6), (0, 4)]]
+        vertices = [vertex for polygon in polygons for vertex in polygon]
+        offsets = [0, 3, 7, 12]
+        for actual, polygon in zip(polygon_areas(vertices, offsets), polygons):
+            self.assertAlmostEqual(actual, Polygon(polygon).get_area())
+        for actual, polygon in zip(polygon_perimeters(vertices, offsets), polygons):
+            self.assertAlmostEqual(actual, Polygon(polygon).get_perimeter())
+        self.assertAlmostEqual(Polygon.from_rectangle(Rectangle(3, 6)).get_area(), 18)
+
+    @unittest.skipIf(polygon_area_calculator.np is None, 'NumPy is not installed')
+    def test_polygon_errors(self):
+        vertices = [(0, 0), (4, 0), (4, 3), (0, 0), (2, 0), (2, 2), (0, 2)]
+        with self.assertRaises(ValueError):
+            polygon_areas(vertices, [0, 2, 7])
+        with self.assertRaises(ValueError):
+            polygon_areas(vertices, [1, 4, 7])
+        with self.assertRaises(ValueError):
+            polygon_perimeters(vertices, [0, 3, 6])
+        with self.assertRaises(ValueError):
+            Polygon([(0, 0), (1, 1)])
+
+    def test_write_picture(self):
+        for shape in [Rectangle(7, 3), Square(4), Rectangle(50, 50), Rectangle(0, 5)]:
+            writer = io.StringIO()
+            self.assertEqual(shape.write_picture(writer), 1)
+            self.assertEqual(writer.getvalue(), shape.get_picture())
+        writer = io.StringIO()
+        write_picture(Rectangle(100, 20), writer)
+        self.assertEqual(writer.getvalue(), ('*' * 50 + '\n') * 10)
+
+    def test_canvas(self):
+        canvas = Canvas(10, 6, background='.')
+        canvas.draw(Rectangle(3, 2), 1, 1)
+        canvas.draw(Rectangle(4, 10), 8, 4, '#')
+        expected = '..........\n.***......\n.***......\n..........\n........##\n........##\n'
+        self.assertEqual(canvas.get_picture(), expected)
+        writer = io.StringIO()
+        canvas.write(writer)
+        self.assertEqual(writer.getvalue(), expected)
+
+    def test_canvas_scaled(self):
+        container = Rectangle(200, 100)
+        canvas = Canvas(container.width, container.height, max_width=20, max_height=10)
+        canvas.draw_placements(container.get_packing(Square(50)))
+        self.assertEqual((canvas.columns, canvas.rows), (20, 10))
+        self.assertEqual(canvas.get_picture(), ('*' * 20 + '\n') * 10)
+
+    def test_canvas_characters(self):
+        for background in ['ab', '', 'é', 1]:
+            with self.assertRaises(ValueError):
+                Canvas(10, 10, background=background)
+        canvas = Canvas(5, 2)
+        for fill in ['**', '', 'é']:
+            with self.assertRaises(ValueError):
+                canvas.draw(Rectangle(5, 2), fill=fill)
+        self.assertEqual(canvas.get_picture(), '     \n     \n')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,21 @@ Building a Probability Calculator project
 balls randomly from a hat
 """
 
-import copy
 import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import comb, sqrt
+import os
+from statistics import NormalDist
+
+try:
+    import numpy as np
+except ImportError: # NumPy is only needed by the batched experiment engine
+    np = None
+
+# Upper bound on the number of random keys generated per batch of trials
+BATCH_KEYS_LIMIT = 2_000_000
 
 class Hat:
     """
@@ -26,6 +39,8 @@ class Hat:
         """
         # A list to store the collection of ball colors in the "hat"
         self.contents = []
+        # Indexes swapped by the last draw, so it can be undone
+        self._swaps = []
         # Going thru every ball of every color
         for color, amount in kwargs.items():
             # Setting the attributes(color and quantity) of each ball
@@ -52,6 +67,8 @@ class Hat:
         draw_list = []
         # Storing the balls list in the hat
         contents = self.contents
+        # Recording the index picked for every ball drawn
+        swaps = self._swaps = []
         # Comparing the number of balls drawn from the hat to 
         # the number of balls in the hat
         if balls_drawn > len(contents): # Balls drawn being greater than available in the hat
@@ -59,20 +76,74 @@ class Hat:
             draw_list = contents.copy()
             # Removing all the balls from the hat
             contents.clear()
+            # Nothing was swapped, the whole hat was taken out in order
+            self._swaps = None
             return draw_list
         else: # Balls drawn being less than available in the hat
             # Looping until balls drawn from the hat is greater than the draw list
             while len(draw_list) < balls_drawn:
                 # Randomizing index from 0 to the length of the balls list
                 index = random.randint(0, len(contents) - 1)
-                # Picking out the ball based on the index from the hat
-                ball = contents[index]
+                # Swapping the picked ball with the last one so it can be
+                # popped off in constant time instead of shifting the list
+                contents[index], contents[-1] = contents[-1], contents[index]
+                swaps.append(index)
                 # Removing the ball from the hat and putting it in the draw list
-                contents.remove(ball)
-                draw_list.append(ball)
+                draw_list.append(contents.pop())
 
         return draw_list
 
+    def undo_draw(self, draw_list):
+        """
+        Puts the balls returned by the last draw() back in the hat,
+        leaving it exactly as it was before that draw. Only the
+        swaps made by the draw are undone, so it costs as much as
+        the draw itself instead of the size of the hat
+
+        Parameters:
+            self (object):
+                The instance of the Hat object
+            draw_list (list):
+                Balls returned by the last call to draw()
+        """
+        contents = self.contents
+        # The whole hat was drawn, so the balls only need to go back
+        if self._swaps is None:
+            contents.extend(draw_list)
+        else:
+            # Undoing the swaps in reverse order of the draw
+            for index, ball in zip(reversed(self._swaps), reversed(draw_list)):
+                contents.append(ball)
+                contents[index], contents[-1] = contents[-1], contents[index]
+        # A draw can only be undone once
+        self._swaps = []
+
+    def snapshot(self):
+        """
+        Takes a copy of the balls currently in the hat, so the hat
+        can be put back in that state after drawing
+
+        Parameters:
+            self (object):
+                The instance of the Hat object
+        Returns:
+            (list):
+                Copy of the balls in the hat
+        """
+        return self.contents.copy()
+
+    def reset(self, snapshot):
+        """
+        Puts the hat back in the state recorded by snapshot()
+
+        Parameters:
+            self (object):
+                The instance of the Hat object
+            snapshot (list):
+                Balls returned by snapshot()
+        """
+        self.contents[:] = snapshot
+
 def experiment(hat, expected_balls, num_balls_drawn, num_experiments):
     """
     Calculates the probability of certain balls drawn from a hat
@@ -97,10 +168,10 @@ def experiment(hat, expected_balls, num_balls_drawn, num_experiments):
     expected_balls_count = 0
     # Iterating through each experiment
     for _ in range(num_experiments):
-        # Duplicating hat object
-        ext_hat = copy.deepcopy(hat)
         # Calling draw() to extract the number of balls asked
-        ball_draw = ext_hat.draw(num_balls_drawn)
+        ball_draw = hat.draw(num_balls_drawn)
+        # Putting the drawn balls back in the hat
+        hat.undo_draw(ball_draw)
         # Keeping the ball color count
         ball_count_color = 0
         # Iterating through each ball from the expected ball group
@@ -117,6 +188,342 @@ def experiment(hat, expected_balls, num_balls_drawn, num_experiments):
 
     return probability
 
+def _count_hits(codes, targets, num_balls_drawn, num_experiments, rng):
+    """
+    Runs a number of trials as NumPy draws without replacement and
+    counts the ones containing at least the expected balls
+
+    Parameters:
+        codes (ndarray):
+            Color index of every ball in the hat
+        targets (list):
+            Pairs of (color index, minimum count) for every expected color
+        num_balls_drawn (int):
+            Number of balls to draw out of the hat per trial
+        num_experiments (int):
+            Number of trials to run
+        rng (Generator):
+            NumPy random generator the draws are taken from
+    Returns:
+        hits (int):
+            Number of trials where the expected balls were drawn
+    """
+    hits = 0
+    # Drawing more balls than the hat holds takes all of them every time
+    if num_balls_drawn >= len(codes):
+        drawn_counts = np.bincount(codes, minlength=len(targets) + 1)
+        if all(drawn_counts[color] >= amount for color, amount in targets):
+            hits = num_experiments
+        return hits
+
+    # Keeping every batch of random keys below the memory limit
+    batch_size = max(1, BATCH_KEYS_LIMIT // len(codes))
+    remaining = num_experiments
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        remaining -= size
+        # Sorting random keys gives a uniform random permutation of each row,
+        # so the balls behind the smallest keys form a draw without replacement
+        keys = rng.random((size, len(codes)))
+        picked = np.argpartition(keys, num_balls_drawn - 1, axis=1)[:, :num_balls_drawn]
+        drawn = codes[picked]
+        # Checking every expected color for all trials at once
+        success = np.ones(size, dtype=bool)
+        for color, amount in targets:
+            success &= (drawn == color).sum(axis=1) >= amount
+        hits += int(success.sum())
+
+    return hits
+
+def _encode_hat(hat, expected_balls):
+    """
+    Encodes the hat contents as an integer color index array
+
+    Parameters:
+        hat (object):
+            Object containing balls
+        expected_balls (object):
+            Indicates the exact group of balls will be drawn
+    Returns:
+        codes (ndarray):
+            Color index of every ball in the hat
+        targets (list):
+            Pairs of (color index, minimum count) for every expected color
+    """
+    if np is None:
+        raise ImportError("NumPy is required for the batched experiment engine")
+    # Giving the expected colors the first indexes and every other color the last one
+    color_index = {color: index for index, color in enumerate(expected_balls)}
+    other = len(color_index)
+    codes = np.fromiter((color_index.get(ball, other) for ball in hat.contents),
+                        dtype=np.intp, count=len(hat.contents))
+    targets = [(color_index[color], amount) for color, amount in expected_balls.items()]
+
+    return codes, targets
+
+def batch_experiment(hat, expected_balls, num_balls_drawn, num_experiments, seed=None):
+    """
+    Calculates the same probability as experiment() by running
+    all the trials as batched NumPy draws instead of one at a time
+
+    Parameters:
+        hat (object):
+            Object containing balls
+        expected_balls (object):
+            Indicates the exact group of balls will be drawn
+        num_balls_drawn (int):
+            Number of balls to draw out of the hat
+        num_experiments (int):
+            Number of experiments to perform
+        seed (int, optional):
+            Seed for the random generator, to reproduce a run
+    Returns:
+        probability (float):
+            Probability values for a certain expected balls drawn
+            from a hat
+    """
+    codes, targets = _encode_hat(hat, expected_balls)
+    rng = np.random.default_rng(seed)
+    hits = _count_hits(codes, targets, num_balls_drawn, num_experiments, rng)
+
+    # Calculating probability
+    probability = hits / num_experiments
+
+    return probability
+
+def _run_shard(codes, targets, num_balls_drawn, num_experiments, seed_sequence):
+    """
+    Runs one worker's share of the trials with its own random stream
+
+    Parameters:
+        codes (ndarray):
+            Color index of every ball in the hat
+        targets (list):
+            Pairs of (color index, minimum count) for every expected color
+        num_balls_drawn (int):
+            Number of balls to draw out of the hat per trial
+        num_experiments (int):
+            Number of trials in this shard
+        seed_sequence (SeedSequence):
+            Seed sequence spawned for this shard
+    Returns:
+        hits (int):
+            Number of trials where the expected balls were drawn
+    """
+    rng = np.random.default_rng(seed_sequence)
+
+    return _count_hits(codes, targets, num_balls_drawn, num_experiments, rng)
+
+def _wilson_interval(hits, trials, z=1.96):
+    """
+    Calculates the Wilson score interval of an estimated probability
+
+    Parameters:
+        hits (int):
+            Number of successful trials
+        trials (int):
+            Number of trials performed
+        z (float):
+            Standard normal quantile of the confidence level
+    Returns:
+        (tuple):
+            Lower and upper bounds of the interval
+    """
+    proportion = hits / trials
+    denominator = 1 + z ** 2 / trials
+    centre = (proportion + z ** 2 / (2 * trials)) / denominator
+    margin = z * sqrt(proportion * (1 - proportion) / trials
+                      + z ** 2 / (4 * trials ** 2)) / denominator
+
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+def parallel_experiment(hat, expected_balls, num_balls_drawn, num_experiments,
+                        seed=0, workers=None):
+    """
+    Calculates the probability by splitting the trials across worker
+    processes, each drawing from a stream spawned from one root seed.
+    The same seed and number of workers always give the same result.
+
+    Parameters:
+        hat (object):
+            Object containing balls
+        expected_balls (object):
+            Indicates the exact group of balls will be drawn
+        num_balls_drawn (int):
+            Number of balls to draw out of the hat
+        num_experiments (int):
+            Number of experiments to perform
+        seed (int):
+            Root seed every worker's stream is spawned from
+        workers (int, optional):
+            Number of worker processes, defaults to the CPU count
+    Returns:
+        probability (float):
+            Probability values for a certain expected balls drawn
+            from a hat
+        interval (tuple):
+            95% Wilson confidence interval of the probability
+    """
+    codes, targets = _encode_hat(hat, expected_balls)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Giving each worker an equal share, with the remainder going to the first ones
+    share, remainder = divmod(num_experiments, workers)
+    shards = [share + 1 if i < remainder else share for i in range(workers)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_shard, codes, targets, num_balls_drawn,
+                                   shard, seed_sequence)
+                   for shard, seed_sequence in zip(shards, seed_sequences)]
+        hits = sum(future.result() for future in futures)
+
+    # Calculating probability
+    probability = hits / num_experiments
+
+    return probability, _wilson_interval(hits, num_experiments)
+
+def adaptive_experiment(hat, expected_balls, num_balls_drawn, target_width=None,
+                        target_se=None, confidence=0.95, initial_batch=1000,
+                        max_experiments=10 ** 8, seed=None):
+    """
+    Calculates the probability to a requested precision by running
+    trials in growing batches until the Wilson interval is narrow enough
+    (or the standard error small enough)
+
+    Parameters:
+        hat (object):
+            Object containing balls
+        expected_balls (object):
+            Indicates the exact group of balls will be drawn
+        num_balls_drawn (int):
+            Number of balls to draw out of the hat
+        target_width (float, optional):
+            Widest acceptable confidence interval
+        target_se (float, optional):
+            Largest acceptable standard error of the estimate
+        confidence (float):
+            Confidence level of the interval
+        initial_batch (int):
+            Number of trials in the first batch, doubled every batch after
+        max_experiments (int):
+            Number of trials to stop at if the target is never reached
+        seed (int, optional):
+            Seed for the random generator, to reproduce a run
+    Returns:
+        probability (float):
+            Probability values for a certain expected balls drawn
+            from a hat
+        interval (tuple):
+            Wilson confidence interval of the probability
+        num_experiments (int):
+            Number of experiments it took to reach the target
+    """
+    if target_width is None and target_se is None:
+        raise ValueError("Either target_width or target_se must be given")
+    if initial_batch <= 0 or max_experiments <= 0:
+        raise ValueError("initial_batch and max_experiments must be positive")
+
+    codes, targets = _encode_hat(hat, expected_balls)
+    rng = np.random.default_rng(seed)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    hits = 0
+    num_experiments = 0
+    batch = initial_batch
+    while True:
+        # Never running past the maximum number of experiments
+        batch = min(batch, max_experiments - num_experiments)
+        hits += _count_hits(codes, targets, num_balls_drawn, batch, rng)
+        num_experiments += batch
+
+        probability = hits / num_experiments
+        interval = _wilson_interval(hits, num_experiments, z)
+        # Checking if either precision target has been reached
+        if target_width is not None and interval[1] - interval[0] <= target_width:
+            break
+        # Deriving the standard error from the interval, which unlike the
+        # plain binomial formula does not collapse to zero with no hits
+        standard_error = (interval[1] - interval[0]) / (2 * z)
+        if target_se is not None and standard_error <= target_se:
+            break
+        if num_experiments >= max_experiments:
+            break
+        # Doubling the batch so the number of checks grows only logarithmically
+        batch *= 2
+
+    return probability, interval, num_experiments
+
+@lru_cache(maxsize=None)
+def _binomial(n, k):
+    """
+    Cached binomial coefficient shared by the exact probability calculations
+
+    Parameters:
+        n (int):
+            Number of balls to choose from
+        k (int):
+            Number of balls chosen
+    Returns:
+        (int):
+            Number of ways to choose k balls out of n
+    """
+    return comb(n, k)
+
+def exact_probability(hat, expected_balls, num_balls_drawn):
+    """
+    Calculates the exact probability experiment() approximates, using
+    the multivariate hypergeometric distribution of the hat's colors
+
+    Parameters:
+        hat (object):
+            Object containing balls
+        expected_balls (object):
+            Indicates the exact group of balls will be drawn
+        num_balls_drawn (int):
+            Number of balls to draw out of the hat
+    Returns:
+        probability (float):
+            Probability values for a certain expected balls drawn
+            from a hat
+    """
+    # Counting the balls currently in the hat by color
+    color_counts = Counter(hat.contents)
+    total = len(hat.contents)
+
+    # Drawing more balls than the hat holds takes all of them
+    if num_balls_drawn >= total:
+        for color, amount in expected_balls.items():
+            if color_counts[color] < amount:
+                return 0.0
+        return 1.0
+
+    # ways[s] holds the number of ways to draw s balls of the expected
+    # colors with every expected color meeting its minimum count
+    ways = [1]
+    for color, amount in expected_balls.items():
+        available = color_counts[color]
+        new_ways = [0] * (min(len(ways) - 1 + available, num_balls_drawn) + 1)
+        # Combining every partial draw with every allowed count of this color
+        for drawn, count in enumerate(ways):
+            if count == 0:
+                continue
+            for taken in range(amount, min(available, num_balls_drawn - drawn) + 1):
+                new_ways[drawn + taken] += count * _binomial(available, taken)
+        ways = new_ways
+
+    # Filling the rest of the draw with balls of the other colors
+    others = total - sum(color_counts[color] for color in expected_balls)
+    favourable = 0
+    for drawn, count in enumerate(ways):
+        favourable += count * _binomial(others, num_balls_drawn - drawn)
+
+    # Calculating probability
+    probability = favourable / _binomial(total, num_balls_drawn)
+
+    return probability
+
 if __name__ == "__main__":
     hat = Hat(black=5, red=7, green=6)
     solution = experiment(hat=hat,
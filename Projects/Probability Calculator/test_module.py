@@ -0,0 +1,84 @@
+import unittest
+import random
+from itertools import combinations
+import probability_calculator
+from probability_calculator import (Hat, experiment, batch_experiment, parallel_experiment,
+                                    adaptive_experiment, exact_probability)
+
+def brute_force_probability(hat, expected_balls, num_balls_drawn):
+    draws = list(combinations(range(len(hat.contents)), num_balls_drawn))
+    hits = 0
+    for draw in draws:
+        balls = [hat.contents[index] for index in draw]
+        if all(balls.count(color) >= amount for color, amount in expected_balls.items()):
+            hits += 1
+    return hits / len(draws)
+
+class UnitTests(unittest.TestCase):
+
+    def setUp(self):
+        self.hat = Hat(blue=3, red=2, green=6)
+        self.expected_balls = {'blue': 2, 'green': 1}
+        self.exact = brute_force_probability(self.hat, self.expected_balls, 4)
+
+    @unittest.skipIf(probability_calculator.np is None, 'NumPy is not installed')
+    def test_batch_experiment(self):
+        actual = batch_experiment(self.hat, self.expected_balls, 4, 50000, seed=1)
+        self.assertAlmostEqual(actual, self.exact, delta=0.01)
+
+    def test_exact_probability(self):
+        for hat, expected_balls, num_balls_drawn in [
+                (self.hat, self.expected_balls, 4),
+                (Hat(red=3, blue=2), {'red': 2}, 3),
+                (Hat(red=2, blue=2, green=1), {'red': 1, 'green': 1}, 2),
+                (Hat(red=2, blue=1), {'red': 3}, 3),
+                (Hat(red=2, blue=1), {'red': 1}, 0)]:
+            self.assertAlmostEqual(exact_probability(hat, expected_balls, num_balls_drawn),
+                                   brute_force_probability(hat, expected_balls, num_balls_drawn))
+
+    @unittest.skipIf(probability_calculator.np is None, 'NumPy is not installed')
+    def test_parallel_experiment(self):
+        actual, (low, high) = parallel_experiment(self.hat, self.expected_balls, 4, 50000,
+                                                  seed=7, workers=2)
+        self.assertAlmostEqual(actual, self.exact, delta=0.01)
+        self.assertLessEqual(low, actual)
+        self.assertLessEqual(actual, high)
+
+    @unittest.skipIf(probability_calculator.np is None, 'NumPy is not installed')
+    def test_parallel_experiment_reproducible(self):
+        first = parallel_experiment(self.hat, self.expected_balls, 4, 20000, seed=3, workers=2)
+        second = parallel_experiment(self.hat, self.expected_balls, 4, 20000, seed=3, workers=2)
+        self.assertEqual(first, second)
+
+    def test_hat_draw(self):
+        hat = Hat(red=5, blue=2)
+        actual = hat.draw(2)
+        self.assertEqual(len(actual), 2)
+        self.assertEqual(len(hat.contents), 5)
+
+    def test_experiment(self):
+        random.seed(95)
+        actual = experiment(self.hat, self.expected_balls, 4, 20000)
+        self.assertAlmostEqual(actual, self.exact, delta=0.02)
+        self.assertEqual(len(self.hat.contents), 11)
+
+    @unittest.skipIf(probability_calculator.np is None, 'NumPy is not installed')
+    def test_adaptive_experiment(self):
+        actual, (low, high), num_experiments = adaptive_experiment(
+            self.hat, self.expected_balls, 4, target_width=0.01, seed=5)
+        self.assertAlmostEqual(actual, self.exact, delta=0.01)
+        self.assertLessEqual(high - low, 0.01)
+        self.assertGreater(num_experiments, 0)
+        for arguments in [{'initial_batch': 0}, {'max_experiments': 0}, {'initial_batch': -5}]:
+            with self.assertRaises(ValueError):
+                adaptive_experiment(self.hat, self.expected_balls, 4, target_width=0.01, **arguments)
+
+    def test_undo_draw(self):
+        hat = Hat(red=5, blue=2, green=4)
+        contents = hat.contents.copy()
+        for balls_drawn in (0, 1, 5, 11, 20):
+            hat.undo_draw(hat.draw(balls_drawn))
+            self.assertEqual(hat.contents, contents)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,43 +1,47 @@
 '''Building a Time Calculator'''
 
-def add_time(start: str, duration: str, day=None):
+from functools import lru_cache, total_ordering
+
+try:
+    import numpy as np
+except ImportError: # NumPy is only needed by add_time_batch()
+    np = None
+
+# Constants
+DAYS_OF_THE_WEEK = (
+    'Sunday',
+    'Monday', 
+    'Tuesday', 
+    'Wednesday', 
+    'Thursday', 
+    'Friday', 
+    'Saturday' 
+)
+# Looking up a day's position in the week without searching the list
+DAY_INDEXES = {day: index for index, day in enumerate(DAYS_OF_THE_WEEK)}
+NUMBER_OF_DAYS_IN_A_WEEK = 7
+HOURS_IN_HALF_A_DAY = 12
+MINUTES_IN_AN_HOUR = 60
+MINUTES_IN_A_DAY = 24 * MINUTES_IN_AN_HOUR
+MIDNIGHT_TIME = 0
+
+
+@lru_cache(maxsize=4096)
+def _parse_start(start: str) -> int:
     """
-    Adds a start time and a duration time and returns the result.
-    
-    Parameters: 
+    Parses a start time into minutes since midnight. Cached, since
+    the same start times come up again and again.
+
+    Parameters:
     start : str
-        The start time composed of hours, minutes, and meridian 
+        The start time composed of hours, minutes, and meridian
         in a 12-hour format
-    duration : str
-        Hours and minutes needed to be added to the start time
-    day : str, optional
     """
-
-    # Constants
-    HOURS_IN_A_DAY = 24
-    HOURS_IN_HALF_A_DAY = 12
-    MINUTES_IN_AN_HOUR = 60
-    DAYS_OF_THE_WEEK = [
-        'Sunday',
-        'Monday', 
-        'Tuesday', 
-        'Wednesday', 
-        'Thursday', 
-        'Friday', 
-        'Saturday' 
-    ]
-    NUMBER_OF_DAYS_IN_A_WEEK = 7
-    DAYS_PASSED = 0
-    HOURS_PASSED = 0
-    MIDNIGHT_TIME = 0
-
-    # Extracting the numbers from the start and duration
-    start_hrs = int(start.split(':')[0]) # Starting time hours
-    start_mins = int(start.split(':')[1][:2]) # Starting time minutes
-    start_meridian = start.split(':')[1][3:] # Starting time meridian
-
-    duration_hrs = int(duration.split(':')[0]) # Duration time hours
-    duration_mins = int(duration.split(':')[1]) # Duration time minutes
+    # Extracting the numbers from the start
+    start_hrs, rest = start.split(':')
+    start_hrs = int(start_hrs) # Starting time hours
+    start_mins = int(rest[:2]) # Starting time minutes
+    start_meridian = rest[3:] # Starting time meridian
 
     # Converting to 24-hour format for easier calculation
     if start_meridian == 'PM' and start_hrs != HOURS_IN_HALF_A_DAY: # For evening and night times
@@ -45,56 +49,246 @@ def add_time(start: str, duration: str, day=None):
     elif start_meridian == 'AM' and start_hrs == HOURS_IN_HALF_A_DAY: # For midnight time
         start_hrs = MIDNIGHT_TIME
 
-    # Adding duration hours and minutes to start hours and minutes
-    total_hrs = start_hrs + duration_hrs
-    total_mins = start_mins + duration_mins
+    return start_hrs * MINUTES_IN_AN_HOUR + start_mins
+
+
+@lru_cache(maxsize=4096)
+def _parse_duration(duration: str) -> int:
+    """
+    Parses a duration into minutes. Cached, since the same
+    durations come up again and again.
+
+    Parameters:
+    duration : str
+        Hours and minutes needed to be added to the start time
+    """
+    duration_hrs, duration_mins = duration.split(':')
+
+    return int(duration_hrs) * MINUTES_IN_AN_HOUR + int(duration_mins)
+
+
+def _day_index(day: str) -> int:
+    """
+    Finds the position of a day in the week, in any letter case
+
+    Parameters:
+    day : str
+        A day of the week
+    """
+    try:
+        return DAY_INDEXES[day.capitalize()]
+    except KeyError:
+        raise ValueError(f"{day!r} is not a day of the week") from None
 
-    # Handling overflow of minutes
-    if total_mins >= MINUTES_IN_AN_HOUR:
-        total_hrs += 1 # Incrementing the hours --> 60 mins = 1 hour
-        total_mins %= MINUTES_IN_AN_HOUR
 
-    # Handling overflow of hours
-    DAYS_PASSED = total_hrs // HOURS_IN_A_DAY # Carryforwarding extra hours into days
+def add_time(start: str, duration: str, day=None):
+    """
+    Adds a start time and a duration time and returns the result.
+    
+    Parameters: 
+    start : str
+        The start time composed of hours, minutes, and meridian 
+        in a 12-hour format
+    duration : str
+        Hours and minutes needed to be added to the start time
+    day : str, optional
+    """
+    # Adding the duration to the start as minutes since the start day's midnight
+    total_mins = _parse_start(start) + _parse_duration(duration)
 
-    # Handling overflow of minutes
-    HOURS_PASSED = total_hrs % HOURS_IN_A_DAY # Storing the remaining minutes after handling hours overflow
+    # Carrying the minutes over into days, hours and minutes
+    days_passed, minutes_of_day = divmod(total_mins, MINUTES_IN_A_DAY)
+    hours_passed, minutes = divmod(minutes_of_day, MINUTES_IN_AN_HOUR)
 
     # Converting back to 12-hour format
-    if HOURS_PASSED == 0: # If it's midnight
-        HOURS_PASSED = HOURS_IN_HALF_A_DAY
-        start_meridian = 'AM'
-    elif HOURS_PASSED < HOURS_IN_HALF_A_DAY: # If it's before afternoon
-        start_meridian = 'AM'
-    elif HOURS_PASSED == HOURS_IN_HALF_A_DAY: # If it's exactly afternoon
-        start_meridian = 'PM'
-    else: # If it's evening or night time
-        HOURS_PASSED -= HOURS_IN_HALF_A_DAY
-        start_meridian = 'PM'
+    meridian = 'PM' if hours_passed >= HOURS_IN_HALF_A_DAY else 'AM'
+    hours_passed = hours_passed % HOURS_IN_HALF_A_DAY or HOURS_IN_HALF_A_DAY # Midnight and noon are 12
 
     # Handling the days of the week
     if day is not None: # Checking if the optional parameter is entered
-        # Making the 1st letter upper case and the rest lower
-        day_entered = day.capitalize()
-        # Finding the position of the day entered in the week list
-        day_on_the_week_index = DAYS_OF_THE_WEEK.index(day_entered)
-        # Finding the new position after accounting for days passed in the week list
-        new_day_index = (day_on_the_week_index + DAYS_PASSED) % NUMBER_OF_DAYS_IN_A_WEEK
-        # Storing the day at the new position
-        new_day = DAYS_OF_THE_WEEK[new_day_index]
+        # Finding the new position after accounting for days passed in the week
+        new_day = DAYS_OF_THE_WEEK[(_day_index(day) + days_passed) % NUMBER_OF_DAYS_IN_A_WEEK]
     else: # If the optional parameter's empty
         new_day = None
 
-    # Bringing in final calculated hours and minutes
-    new_time = f"{HOURS_PASSED}:{total_mins:02d} {start_meridian}" # ':02d' adds in leading zeros whenever needed
+    # Returning the result
+    return _format_time(hours_passed, minutes, meridian, days_passed, new_day)
+
+
+@total_ordering
+class ClockTime:
+    """
+    A time that durations can be added to repeatedly without going
+    through strings, e.g. for the legs of an itinerary:
+        arrival = ClockTime.parse('11:59 PM', 'Wednesday') + '24:05' + 90
+
+    It keeps the minutes since midnight of the start day and the start
+    day's position in the week, and only renders to add_time()'s
+    format when it is turned into a string.
+    """
+    __slots__ = ('minutes', 'day_index')
+
+    def __init__(self, minutes: int, day_index=None):
+        """
+        Parameters:
+        minutes : int
+            Minutes since midnight of the start day
+        day_index : int, optional
+            Position of the start day in DAYS_OF_THE_WEEK
+        """
+        self.minutes = minutes
+        self.day_index = day_index
+
+    @classmethod
+    def parse(cls, start: str, day=None):
+        """
+        Creates a time from a start time string like add_time() takes
+
+        Parameters:
+        start : str
+            The start time composed of hours, minutes, and meridian
+            in a 12-hour format
+        day : str, optional
+        """
+        return cls(_parse_start(start), None if day is None else _day_index(day))
+
+    def __add__(self, duration):
+        """
+        Returns the time a duration later
+
+        Parameters:
+        duration : str or int
+            Hours and minutes like add_time() takes, or a number of minutes
+        """
+        if isinstance(duration, str):
+            duration = _parse_duration(duration)
+        elif not isinstance(duration, int):
+            return NotImplemented
+
+        return ClockTime(self.minutes + duration, self.day_index)
+
+    def _week_key(self):
+        """
+        Orders times by minutes since the start of the start day's week
+        when the weekday is known, breaking ties by the start day
+        """
+        return (self.day_index * MINUTES_IN_A_DAY + self.minutes, self.day_index)
+
+    def __eq__(self, other):
+        if not isinstance(other, ClockTime):
+            return NotImplemented
+        return (self.minutes, self.day_index) == (other.minutes, other.day_index)
+
+    def __lt__(self, other):
+        if not isinstance(other, ClockTime):
+            return NotImplemented
+        # Only comparing times that both have, or both lack, a weekday
+        if (self.day_index is None) != (other.day_index is None):
+            return NotImplemented
+        if self.day_index is None:
+            return self.minutes < other.minutes
+        return self._week_key() < other._week_key()
+
+    def __hash__(self):
+        return hash((self.minutes, self.day_index))
+
+    @property
+    def days_passed(self) -> int:
+        """Number of days after the start day"""
+        return self.minutes // MINUTES_IN_A_DAY
+
+    @property
+    def weekday(self):
+        """Day of the week of the time, or None if the start day is unknown"""
+        if self.day_index is None:
+            return None
+        return DAYS_OF_THE_WEEK[(self.day_index + self.days_passed) % NUMBER_OF_DAYS_IN_A_WEEK]
+
+    def __repr__(self):
+        return f"ClockTime(minutes={self.minutes}, day_index={self.day_index})"
+
+    def __str__(self):
+        # Converting the minutes of the current day to 12-hour format
+        hours_passed, minutes = divmod(self.minutes % MINUTES_IN_A_DAY, MINUTES_IN_AN_HOUR)
+        meridian = 'PM' if hours_passed >= HOURS_IN_HALF_A_DAY else 'AM'
+        hours_passed = hours_passed % HOURS_IN_HALF_A_DAY or HOURS_IN_HALF_A_DAY
+
+        return _format_time(hours_passed, minutes, meridian, self.days_passed, self.weekday)
+
+
+def _format_time(hours, minutes, meridian, days_passed, new_day=None):
+    """
+    Formats a calculated time the way add_time() returns it
+
+    Parameters:
+    hours : int
+        Hours in a 12-hour format
+    minutes : int
+        Minutes past the hour
+    meridian : str
+        'AM' or 'PM'
+    days_passed : int
+        Number of days after the start day
+    new_day : str, optional
+        Day of the week of the calculated time
+    """
+    new_time = f"{hours}:{minutes:02d} {meridian}"
     if new_day:
-        new_time += f", {new_day}" 
+        new_time += f", {new_day}"
 
     # Handle next day or days later message
-    if DAYS_PASSED == 1:
+    if days_passed == 1:
         new_time += " (next day)"
-    elif DAYS_PASSED > 1:
-        new_time += f" ({DAYS_PASSED} days later)"
+    elif days_passed > 1:
+        new_time += f" ({days_passed} days later)"
 
-    # Returning the result
     return new_time
+
+
+def add_time_batch(starts, durations, days=None):
+    """
+    Adds many start times and durations at once, returning the same
+    strings add_time() would for each pair. The strings are parsed into
+    integer minutes, and the carries into hours, days, meridians and
+    weekdays are worked out with NumPy array operations.
+
+    Parameters:
+    starts : sequence of str
+        Start times composed of hours, minutes, and meridian
+        in a 12-hour format
+    durations : sequence of str
+        Hours and minutes to add to each start time
+    days : sequence of str, optional
+        Day of the week of each start time, entries can be None
+    """
+    if np is None:
+        raise ImportError("NumPy is required for add_time_batch()")
+    # Refusing to silently drop or broadcast items of mismatched sequences
+    if len(starts) != len(durations) or (days is not None and len(days) != len(starts)):
+        raise ValueError("starts, durations and days must have the same length")
+
+    # Parsing the strings into minutes since the start day's midnight
+    total = np.fromiter((_parse_start(start) + _parse_duration(duration)
+                         for start, duration in zip(starts, durations)), dtype=np.int64)
+
+    # Carrying the minutes over into days, hours and minutes
+    days_passed, minutes_of_day = np.divmod(total, MINUTES_IN_A_DAY)
+    hours_24, minutes = np.divmod(minutes_of_day, MINUTES_IN_AN_HOUR)
+    is_pm = hours_24 >= HOURS_IN_HALF_A_DAY
+    hours_12 = hours_24 % HOURS_IN_HALF_A_DAY
+    hours_12[hours_12 == 0] = HOURS_IN_HALF_A_DAY
+
+    # Moving the days of the week forward by the days passed
+    if days is not None:
+        day_indexes = np.array([-1 if day is None else _day_index(day)
+                                for day in days], dtype=np.int64)
+        new_day_indexes = np.where(day_indexes < 0, -1,
+                                   (day_indexes + days_passed) % NUMBER_OF_DAYS_IN_A_WEEK)
+        new_days = [DAYS_OF_THE_WEEK[i] if i >= 0 else None for i in new_day_indexes.tolist()]
+    else:
+        new_days = [None] * len(total)
+
+    return [_format_time(hrs, mins, 'PM' if pm else 'AM', passed, new_day)
+            for hrs, mins, pm, passed, new_day in zip(hours_12.tolist(), minutes.tolist(),
+                                                      is_pm.tolist(), days_passed.tolist(),
+                                                      new_days)]
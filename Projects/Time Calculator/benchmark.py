@@ -0,0 +1,153 @@
+'''Throughput benchmark for the Time Calculator'''
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import Time_Calculator
+from Time_Calculator import add_time, add_time_batch, ClockTime
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DAYS = ['Sunday', 'monday', 'TUESDAY', 'Wednesday', 'thursday', 'Friday', 'saturday']
+HOURS_IN_FIVE_YEARS = 5 * 365 * 24
+
+
+def generate_workload(count, seed=0):
+    """
+    Generates random start times, durations of up to five years, and
+    weekdays for about half of them
+
+    Parameters:
+    count : int
+        Number of calls in the workload
+    seed : int
+        Seed for the random workload
+    """
+    rng = random.Random(seed)
+    starts = [f"{rng.randint(1, 12)}:{rng.randint(0, 59):02d} {rng.choice(['AM', 'PM'])}"
+              for _ in range(count)]
+    durations = [f"{rng.randint(0, HOURS_IN_FIVE_YEARS)}:{rng.randint(0, 59):02d}"
+                 for _ in range(count)]
+    days = [rng.choice(DAYS) if rng.random() < 0.5 else None for _ in range(count)]
+
+    return starts, durations, days
+
+
+def run_scalar(starts, durations, days):
+    return [add_time(start, duration, day) for start, duration, day in zip(starts, durations, days)]
+
+
+def run_batch(starts, durations, days):
+    return add_time_batch(starts, durations, days)
+
+
+def run_clock_time(starts, durations, days):
+    return [str(ClockTime.parse(start, day) + duration)
+            for start, duration, day in zip(starts, durations, days)]
+
+
+PATHS = {"add_time": run_scalar, "add_time_batch": run_batch, "ClockTime": run_clock_time}
+
+
+def clear_caches():
+    """Clearing the parser caches, so every path starts cold"""
+    Time_Calculator._parse_start.cache_clear()
+    Time_Calculator._parse_duration.cache_clear()
+
+
+def measure(path, workload, repeats):
+    """
+    Measures the best calls per second of a path over several runs, and
+    with tracemalloc:
+    -> the peak traced memory per call while the path runs, which
+       includes the results it builds
+    -> the memory blocks and bytes per call the path leaves allocated
+       once its results are discarded, such as parser cache entries
+
+    Parameters:
+    path : function
+        Function running the whole workload
+    workload : tuple
+        Start times, durations and days
+    repeats : int
+        Number of timed runs to take the best of
+    """
+    count = len(workload[0])
+
+    best = float("inf")
+    for _ in range(repeats):
+        clear_caches()
+        start = time.perf_counter()
+        path(*workload)
+        best = min(best, time.perf_counter() - start)
+
+    clear_caches()
+    # Leaving tracemalloc's own bookkeeping out of the snapshots
+    own_traces = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(own_traces)
+    traced_before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    results = path(*workload)
+    peak = tracemalloc.get_traced_memory()[1] - traced_before
+    # Discarding the results, so only what the calls left behind is counted
+    del results
+    after = tracemalloc.take_snapshot().filter_traces(own_traces)
+    tracemalloc.stop()
+    differences = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in differences)
+    size = sum(stat.size_diff for stat in differences)
+
+    return {"calls_per_second": count / best,
+            "peak_bytes_per_call": peak / count,
+            "retained_blocks_per_call": blocks / count,
+            "retained_bytes_per_call": size / count}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="fraction of the baseline throughput allowed to be lost")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run's throughput as the baseline")
+    args = parser.parse_args()
+
+    workload = generate_workload(args.calls)
+    paths = dict(PATHS)
+    if Time_Calculator.np is None:
+        del paths["add_time_batch"]
+
+    results = {}
+    for name, path in paths.items():
+        results[name] = measure(path, workload, args.repeats)
+        print(f"{name:>15}: {results[name]['calls_per_second']:12,.0f} calls/s"
+              f"  {results[name]['peak_bytes_per_call']:8.1f} peak bytes/call"
+              f"  {results[name]['retained_blocks_per_call']:6.2f} retained blocks/call"
+              f"  {results[name]['retained_bytes_per_call']:8.1f} retained bytes/call")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as file:
+            json.dump({name: result["calls_per_second"] for name, result in results.items()},
+                      file, indent=4)
+        print(f"Baseline saved to {BASELINE_PATH}")
+        sys.exit(0)
+
+    if not os.path.exists(BASELINE_PATH):
+        print("No baseline stored, run with --save-baseline to create one")
+        sys.exit(0)
+
+    # Failing when any path is slower than the baseline allows
+    with open(BASELINE_PATH) as file:
+        baseline = json.load(file)
+    regressions = [name for name, result in results.items() if name in baseline and
+                   result["calls_per_second"] < baseline[name] * (1 - args.tolerance)]
+    for name in regressions:
+        print(f"Regression: {name} ran at {results[name]['calls_per_second']:,.0f} calls/s,"
+              f" baseline is {baseline[name]:,.0f} calls/s")
+    sys.exit(1 if regressions else 0)
@@ -1,5 +1,6 @@
 import unittest
-from Time_Calculator import add_time
+import Time_Calculator
+from Time_Calculator import add_time, add_time_batch, ClockTime
 
 class UnitTests(unittest.TestCase):
 
@@ -48,5 +49,44 @@ class UnitTests(unittest.TestCase):
         correct_answer = '6:18 AM, Monday (20 days later)'
         self.assertEqual(calculated_answer, correct_answer)
 
+    def test_clock_time(self):
+        start = ClockTime.parse('11:59 PM', 'Wednesday')
+        calculated_answer = str(start + '24:05')
+        correct_answer = add_time('11:59 PM', '24:05', 'Wednesday')
+        self.assertEqual(calculated_answer, correct_answer)
+        calculated_answer = str(start + '12:00' + '12:00' + 5)
+        self.assertEqual(calculated_answer, correct_answer)
+        self.assertLess(start, start + '0:01')
+        self.assertEqual(start + 60, start + '1:00')
+        self.assertEqual((start + '168:00').weekday, 'Wednesday')
+        self.assertEqual(str(ClockTime.parse('3:30 PM') + '2:12'), '5:42 PM')
+
+    def test_clock_time_weekdays(self):
+        monday = ClockTime.parse('1:00 AM', 'Monday')
+        friday = ClockTime.parse('1:00 AM', 'Friday')
+        self.assertNotEqual(monday, friday)
+        self.assertNotEqual(hash(monday), hash(friday))
+        self.assertLess(monday, friday)
+        self.assertLess(friday, monday + '96:01')
+        self.assertEqual(monday, ClockTime.parse('1:00 AM', 'monday'))
+        with self.assertRaises(TypeError):
+            monday < ClockTime.parse('1:00 AM')
+
+    @unittest.skipIf(Time_Calculator.np is None, 'NumPy is not installed')
+    def test_batch(self):
+        starts = ['3:30 PM', '11:55 AM', '2:59 AM', '11:59 PM', '8:16 PM', '12:00 AM', '12:05 PM']
+        durations = ['2:12', '3:12', '24:00', '24:05', '466:02', '0:00', '0:55']
+        days = [None, 'Monday', 'saturDay', 'Wednesday', 'tuesday', None, 'sunday']
+        calculated_answer = add_time_batch(starts, durations, days)
+        correct_answer = [add_time(*args) for args in zip(starts, durations, days)]
+        self.assertEqual(calculated_answer, correct_answer)
+        calculated_answer = add_time_batch(starts, durations)
+        correct_answer = [add_time(*args) for args in zip(starts, durations)]
+        self.assertEqual(calculated_answer, correct_answer)
+        with self.assertRaises(ValueError):
+            add_time_batch(['3:30 PM', '1:00 AM'], ['2:12', '1:00'], ['Monday'])
+        with self.assertRaises(ValueError):
+            add_time_batch(['3:30 PM', '1:00 AM'], ['2:12'])
+
 if __name__ == '__main__':
     unittest.main()